@@ -0,0 +1,269 @@
+import logging
+import sqlite3
+from argparse import ArgumentParser, Namespace
+from contextlib import closing
+from datetime import datetime, timezone
+from pathlib import Path
+from sys import exit
+from typing import Any, Dict, List, Optional
+
+import coloredlogs
+
+from utility import Utility
+
+log: logging.Logger = logging.getLogger(__name__)
+
+SCHEMA: str = """
+CREATE TABLE IF NOT EXISTS stores (
+    hash TEXT PRIMARY KEY,
+    lastUpdated TEXT NOT NULL,
+    archived TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS images (
+    hash TEXT NOT NULL REFERENCES stores (hash),
+    profile TEXT NOT NULL,
+    path TEXT NOT NULL,
+    PRIMARY KEY (hash, profile)
+);
+CREATE TABLE IF NOT EXISTS bundles (
+    hash TEXT NOT NULL REFERENCES stores (hash),
+    id INTEGER NOT NULL,
+    name TEXT,
+    slug TEXT,
+    typeKey TEXT,
+    section TEXT,
+    price INTEGER,
+    lastUpdated TEXT NOT NULL,
+    PRIMARY KEY (hash, id)
+);
+CREATE INDEX IF NOT EXISTS bundles_id ON bundles (id, lastUpdated);
+CREATE INDEX IF NOT EXISTS bundles_name ON bundles (name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS bundles_date ON bundles (lastUpdated);
+CREATE INDEX IF NOT EXISTS bundles_price ON bundles (price);
+"""
+
+
+class Archive:
+    """Local SQLite archive of every processed Store and its Bundles."""
+
+    def Connect(self: Any, database: str) -> sqlite3.Connection:
+        """Open the specified archive, creating its tables if necessary."""
+
+        Path(database).parent.mkdir(parents=True, exist_ok=True)
+
+        # Profiles archive concurrently, so wait for each other's writes
+        db: sqlite3.Connection = sqlite3.connect(database, timeout=30)
+        db.row_factory = sqlite3.Row
+        db.executescript(SCHEMA)
+
+        return db
+
+    def SaveStore(
+        self: Any,
+        database: str,
+        store: Dict[str, Any],
+        image: Optional[str],
+        profile: Optional[str] = None,
+    ) -> None:
+        """
+        Record the provided processed Store, its Bundles, and the path of
+        its rendered image in the archive.
+        """
+
+        apiHash: str = store.get("hash")
+        lastUpdated: str = store.get("lastUpdated")
+
+        with closing(Archive.Connect(self, database)) as db, db:
+            db.execute(
+                "INSERT OR REPLACE INTO stores VALUES (?, ?, ?)",
+                (apiHash, lastUpdated, datetime.now(timezone.utc).isoformat()),
+            )
+            db.executemany(
+                "INSERT OR REPLACE INTO bundles VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        apiHash,
+                        bundle.id,
+                        bundle.name,
+                        bundle.slug,
+                        bundle.typeKey,
+                        bundle.section,
+                        bundle.price,
+                        lastUpdated,
+                    )
+                    for bundles in store.get("sections").values()
+                    for bundle in bundles
+                ],
+            )
+
+            if image is not None:
+                db.execute(
+                    "INSERT OR REPLACE INTO images VALUES (?, ?, ?)",
+                    (apiHash, profile or "", image),
+                )
+
+    def FindBundles(self: Any, database: str, bundle: str) -> List[int]:
+        """Return the IDs of the Bundles matching the provided ID or name."""
+
+        if bundle.isdigit() is True:
+            return [int(bundle)]
+
+        with closing(Archive.Connect(self, database)) as db:
+            rows: List[sqlite3.Row] = db.execute(
+                "SELECT DISTINCT id FROM bundles WHERE name = ? COLLATE NOCASE",
+                (bundle,),
+            ).fetchall()
+
+        return [row["id"] for row in rows]
+
+    def LastSeen(self: Any, database: str, bundleId: int) -> Optional[Dict[str, Any]]:
+        """
+        Return when the specified Bundle was first and last in the Store,
+        the number of Stores it appeared in, and its latest price.
+        """
+
+        with closing(Archive.Connect(self, database)) as db:
+            latest: Optional[sqlite3.Row] = db.execute(
+                """
+                SELECT id, name, section, price, lastUpdated AS lastSeen
+                FROM bundles WHERE id = ? ORDER BY lastUpdated DESC LIMIT 1
+                """,
+                (bundleId,),
+            ).fetchone()
+
+            if latest is None:
+                return
+
+            totals: sqlite3.Row = db.execute(
+                """
+                SELECT MIN(lastUpdated) AS firstSeen, COUNT(*) AS appearances
+                FROM bundles WHERE id = ?
+                """,
+                (bundleId,),
+            ).fetchone()
+
+        return {**dict(latest), **dict(totals)}
+
+    def PriceHistory(self: Any, database: str, bundleId: int) -> List[Dict[str, Any]]:
+        """
+        Return each price of the specified Bundle in chronological order,
+        along with the dates it was first and last offered at that price.
+        """
+
+        with closing(Archive.Connect(self, database)) as db:
+            rows: List[sqlite3.Row] = db.execute(
+                "SELECT price, lastUpdated FROM bundles WHERE id = ? ORDER BY lastUpdated",
+                (bundleId,),
+            ).fetchall()
+
+        history: List[Dict[str, Any]] = []
+
+        for row in rows:
+            if (len(history) > 0) and (history[-1]["price"] == row["price"]):
+                history[-1]["to"] = row["lastUpdated"]
+                history[-1]["appearances"] += 1
+
+                continue
+
+            history.append(
+                {
+                    "price": row["price"],
+                    "from": row["lastUpdated"],
+                    "to": row["lastUpdated"],
+                    "appearances": 1,
+                }
+            )
+
+        return history
+
+    def Initialize(self: Any, args: Namespace) -> int:
+        """Answer the requested query and return the process exit code."""
+
+        database: str = args.database
+
+        if database is None:
+            config: Optional[Dict[str, Any]] = Utility.ReadFile(self, "config.json")
+            database = (config or {}).get("archive", {}).get("path", "archive.db")
+
+        if Path(database).is_file() is False:
+            log.error(f"Failed to find the Store archive {database}")
+
+            return 1
+
+        bundle: str = args.last_seen or args.price_history
+        bundleIds: List[int] = Archive.FindBundles(self, database, bundle)
+
+        if len(bundleIds) == 0:
+            log.error(f"Failed to find the Bundle {bundle} in the Store archive")
+
+            return 1
+
+        found: bool = False
+
+        for bundleId in bundleIds:
+            if args.last_seen is not None:
+                if (seen := Archive.LastSeen(self, database, bundleId)) is None:
+                    log.error(f"Bundle {bundleId} has never been in the Store")
+
+                    continue
+
+                found = True
+
+                print(
+                    f"{seen['name']} ({seen['id']}) was last in the {seen['section']} section for {seen['price']:,} CODPoints on {Archive.FormatDate(self, seen['lastSeen'])}"
+                )
+                print(
+                    f"It has appeared in {seen['appearances']:,} Stores since {Archive.FormatDate(self, seen['firstSeen'])}"
+                )
+            else:
+                history: List[Dict[str, Any]] = Archive.PriceHistory(
+                    self, database, bundleId
+                )
+
+                if len(history) == 0:
+                    log.error(f"Bundle {bundleId} has never been in the Store")
+
+                    continue
+
+                found = True
+
+                print(f"Bundle {bundleId}")
+
+                for period in history:
+                    print(
+                        f"    {period['price']:>6,} CODPoints from {Archive.FormatDate(self, period['from'])} to {Archive.FormatDate(self, period['to'])} ({period['appearances']:,} Stores)"
+                    )
+
+        return 0 if found is True else 1
+
+    def FormatDate(self: Any, timestamp: str) -> str:
+        """Return the provided ISO8601 timestamp in a human-readable format."""
+
+        return f"{Utility.ISOtoHumanDate(self, timestamp)} at {Utility.ISOtoHumanTime(self, timestamp)} UTC"
+
+
+if __name__ == "__main__":
+    coloredlogs.install(
+        level="INFO", fmt="[%(asctime)s] %(message)s", datefmt="%I:%M:%S"
+    )
+
+    parser: ArgumentParser = ArgumentParser(
+        description="Query the archive of previous Modern Warfare and Warzone Stores."
+    )
+    query = parser.add_mutually_exclusive_group(required=True)
+    query.add_argument(
+        "--last-seen",
+        metavar="BUNDLE",
+        help="when the Bundle (ID or name) was last in the Store",
+    )
+    query.add_argument(
+        "--price-history",
+        metavar="BUNDLE",
+        help="every price of the Bundle (ID or name)",
+    )
+    parser.add_argument(
+        "--database", help="path of the archive (archive.path of config.json)"
+    )
+    args: Namespace = parser.parse_args()
+
+    exit(Archive.Initialize(Archive, args))
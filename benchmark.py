@@ -0,0 +1,708 @@
+import json
+import logging
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+from argparse import ArgumentParser, Namespace
+from contextlib import redirect_stdout
+from datetime import datetime
+from functools import partial
+from hashlib import md5
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO, StringIO
+from math import ceil
+from pathlib import Path
+from statistics import median
+from tempfile import TemporaryDirectory
+from threading import Thread
+from time import perf_counter, sleep
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import PIL
+import praw
+import twitter
+from PIL import Image, ImageOps
+
+from emporium import Bundle, Emporium
+from utility import Utility
+
+log: logging.Logger = logging.getLogger(__name__)
+
+
+class StandIn:
+    """
+    Offline stand-in for a third-party client library (Python-Twitter and
+    PRAW), which accepts any call and waits for the configured latency.
+    """
+
+    latency: float = 0.0
+    read_only: bool = False
+
+    def __init__(self: Any, *args, **kwargs) -> None:
+        # Read media to emulate the cost of uploading it
+        for value in list(args) + list(kwargs.values()):
+            if isinstance(value, BytesIO):
+                value.read()
+            elif isinstance(value, str) and value.endswith(".png"):
+                Path(value).read_bytes()
+
+    def __getattr__(self: Any, name: str) -> Any:
+        return self
+
+    def __call__(self: Any, *args, **kwargs) -> Any:
+        StandIn(*args, **kwargs)
+        sleep(StandIn.latency)
+
+        return self
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """
+    Offline stand-in for the Tracker Network API, the trackercdn image
+    CDN, Hep.GG, and Discord webhooks.
+    """
+
+    protocol_version: str = "HTTP/1.1"
+    latency: float = 0.0
+    payload: bytes = b"{}"
+    images: Dict[str, bytes] = {}
+
+    def log_message(self: Any, *args) -> None:
+        pass
+
+    def Respond(
+        self: Any,
+        status: int,
+        body: bytes = b"",
+        contentType: str = "application/json",
+    ) -> None:
+        """Respond with the provided body, honoring conditional requests."""
+
+        sleep(StandInHandler.latency)
+
+        etag: str = f'"{md5(body).hexdigest()}"'
+
+        if (status == 200) and (self.headers.get("If-None-Match") == etag):
+            status, body = (304, b"")
+
+        self.send_response(status)
+
+        if status == 200:
+            self.send_header("content-type", contentType)
+            self.send_header("etag", etag)
+
+        self.send_header("content-length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self: Any) -> None:
+        if self.path == "/store":
+            return self.Respond(200, StandInHandler.payload)
+        elif self.path.startswith("/images/"):
+            name: str = self.path.rsplit("/", 1)[-1].rsplit(".", 1)[0]
+
+            if (image := StandInHandler.images.get(name)) is not None:
+                return self.Respond(200, image, "image/png")
+
+        self.Respond(404)
+
+    def do_POST(self: Any) -> None:
+        self.rfile.read(int(self.headers.get("content-length", 0)))
+
+        if self.path == "/upload":
+            host: str = self.headers.get("host")
+
+            return self.Respond(
+                200, json.dumps({"url": f"http://{host}/i.png"}).encode()
+            )
+        elif self.path.startswith("/webhooks/"):
+            return self.Respond(204)
+
+        self.Respond(404)
+
+
+class Benchmark:
+    """Reproducible offline benchmark suite for the Emporium render and publish paths."""
+
+    def Initialize(self: Any, args: Namespace) -> int:
+        """Run the requested benchmarks and return the process exit code."""
+
+        root: Path = Path(__file__).resolve().parent
+        assets: Path = Path(args.assets).resolve()
+        config: Dict[str, Any] = json.loads((root / "config_example.json").read_text())
+        font: str = config["appearance"].get("font")
+
+        if (assets / "fonts" / f"{font}.ttf").is_file() is False:
+            log.error(f"Failed to find the {font} font in {assets / 'fonts'}")
+
+            return 2
+
+        StandIn.latency = args.latency
+        StandInHandler.latency = args.latency
+        StandInHandler.images = Benchmark.GenerateImages(self)
+
+        server: ThreadingHTTPServer = ThreadingHTTPServer(
+            ("127.0.0.1", 0), StandInHandler
+        )
+        Thread(target=server.serve_forever, daemon=True).start()
+
+        self.config: Dict[str, Any] = Benchmark.Configure(
+            self, config, f"http://127.0.0.1:{server.server_port}", args
+        )
+
+        payloads: Dict[str, Dict[str, Any]] = {
+            f"{size:,} bundles": Benchmark.GeneratePayload(self, size)
+            for size in args.sizes
+        }
+
+        for path in args.payload:
+            payloads[Path(path).stem] = json.loads(Path(path).read_text())
+
+        results: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        original: Dict[str, Any] = {"Twitter": twitter.Api, "Reddit": praw.Reddit}
+        directory: str = os.getcwd()
+
+        with TemporaryDirectory() as workspace:
+            try:
+                twitter.Api = StandIn
+                praw.Reddit = StandIn
+
+                os.chdir(workspace)
+                os.symlink(assets, "assets", target_is_directory=True)
+                Path("config.json").write_text(json.dumps(self.config))
+
+                for name, payload in payloads.items():
+                    StandInHandler.payload = json.dumps(payload).encode()
+
+                    log.info(f"Benchmarking {name}...")
+
+                    results[name] = Benchmark.RunCases(self, payload, args)
+            finally:
+                twitter.Api = original["Twitter"]
+                praw.Reddit = original["Reddit"]
+
+                Benchmark.Reset(self)
+                os.chdir(directory)
+                server.shutdown()
+
+        report: Dict[str, Any] = {
+            "timestamp": datetime.utcnow().isoformat(),
+            "environment": {
+                "python": platform.python_version(),
+                "pillow": PIL.__version__,
+                "platform": platform.platform(),
+                "cpus": os.cpu_count(),
+            },
+            "options": {
+                "repeat": args.repeat,
+                "latency": args.latency,
+                "webhooks": args.webhooks,
+                "overrides": args.set,
+                "startupBudget": args.startup_budget,
+            },
+            "results": results,
+        }
+
+        baseline: Optional[Dict[str, Any]] = None
+
+        if args.baseline is not None:
+            baseline = json.loads(Path(args.baseline).read_text())
+
+        regressions: int = Benchmark.PrintReport(self, report, baseline, args.threshold)
+
+        for name, cases in results.items():
+            if (startup := cases.get("Startup (unchanged)")) is None:
+                continue
+            elif startup["median"] > args.startup_budget:
+                log.error(
+                    f"Startup with an unchanged {name} Store took {startup['median']:.2f}s, exceeding the {args.startup_budget:.2f}s budget"
+                )
+
+                regressions += 1
+
+        if args.output is not None:
+            Path(args.output).write_text(json.dumps(report, indent=4))
+
+            log.info(f"Saved the benchmark report to {args.output}")
+
+        return 1 if regressions > 0 else 0
+
+    def Configure(
+        self: Any, config: Dict[str, Any], host: str, args: Namespace
+    ) -> Dict[str, Any]:
+        """Point the provided configuration at the local stand-ins."""
+
+        config["endpoints"] = {
+            "store": f"{host}/store",
+            "images": f"{host}/images/",
+            "upload": f"{host}/upload",
+        }
+        config["thirdParties"]["discord"]["webhookUrls"] = [
+            f"{host}/webhooks/{i}/benchmark" for i in range(args.webhooks)
+        ]
+        config["metrics"] = {"enabled": False}
+
+        for override in args.set:
+            path, value = override.split("=", 1)
+            keys: List[str] = path.split(".")
+            section: Dict[str, Any] = config
+
+            for key in keys[:-1]:
+                section = section.setdefault(key, {})
+
+            section[keys[-1]] = json.loads(value)
+
+        return config
+
+    def GenerateImages(self: Any, variants: int = 8) -> Dict[str, bytes]:
+        """
+        Generate a deterministic set of billboard and logo images which
+        are served for every Bundle of the synthetic payloads.
+        """
+
+        rng: random.Random = random.Random(0)
+        gradient: Image.Image = Image.linear_gradient("L")
+        images: Dict[str, bytes] = {}
+
+        for i in range(variants):
+            colors: List[Tuple[int, int, int]] = [
+                tuple(rng.randrange(256) for _ in range(3)) for _ in range(2)
+            ]
+
+            billboard: Image.Image = ImageOps.colorize(
+                gradient.rotate(rng.randrange(360)).resize((1920, 1080)), *colors
+            )
+            logo: Image.Image = ImageOps.colorize(
+                gradient.resize((800, 300)), *colors
+            ).convert("RGBA")
+            logo.putalpha(gradient.rotate(90).resize((800, 300)))
+
+            for kind, image in [("billboard", billboard), ("logo", logo)]:
+                buffer: BytesIO = BytesIO()
+                image.save(buffer, "PNG", compress_level=1)
+
+                images[f"{kind}_{i}"] = buffer.getvalue()
+
+        return images
+
+    def GeneratePayload(
+        self: Any, size: int, variants: int = 8, seed: int = 0
+    ) -> Dict[str, Any]:
+        """
+        Generate a deterministic Store API response containing the
+        specified number of Bundles, split across every section.
+        """
+
+        rng: random.Random = random.Random(seed + size)
+        featured: int = max(ceil(size * 0.2), 1)
+        operators: int = max(ceil(size * 0.4), 1)
+        items: List[Dict[str, Any]] = []
+
+        for i in range(size):
+            if i < featured:
+                typeKey: str = "FEATURED"
+            elif i < featured + operators:
+                typeKey = "OPERATOR"
+            else:
+                typeKey = "WEAPON"
+
+            items.append(
+                {
+                    "id": 10000 + i,
+                    "name": f"Benchmark Bundle {i + 1}",
+                    "slug": f"benchmark-bundle-{i + 1}",
+                    "typeKey": typeKey,
+                    "price": rng.choice([1000, 1200, 2000, 2400, 2800]),
+                    "billboard": f"billboard_{i % variants}",
+                    "logo": f"logo_{i % variants}",
+                }
+            )
+
+        return {
+            "data": {
+                "hash": md5(json.dumps(items).encode()).hexdigest(),
+                "lastUpdated": "2020-09-01T17:00:00+00:00",
+                "items": items,
+            }
+        }
+
+    def Reset(self: Any) -> None:
+        """Discard all state which previous runs stored on the Emporium class."""
+
+        Utility.CloseClients(Emporium)
+
+        for name, value in list(vars(Emporium).items()):
+            if (name.startswith("__") is False) and (callable(value) is False):
+                delattr(Emporium, name)
+
+        shutil.rmtree("cache", ignore_errors=True)
+
+    def Prepare(self: Any) -> None:
+        """Reset all state, then load the configuration and assets."""
+
+        Benchmark.Reset(self)
+
+        Emporium.config = self.config
+
+        Utility.LoadAssets(Emporium)
+
+    def Measure(
+        self: Any,
+        task: Callable[[], Any],
+        repeat: int,
+        setup: Optional[Callable[[], Any]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Return the timings of the provided task. Fast tasks are looped so
+        that each timing covers at least 0.2 seconds, while tasks which
+        require setup are timed individually after it.
+        """
+
+        number: int = 1
+
+        # Without setup, each timing may loop over the task
+        if setup is None:
+            while True:
+                start: float = perf_counter()
+
+                for _ in range(number):
+                    task()
+
+                if (perf_counter() - start) >= 0.2:
+                    break
+
+                number *= 10
+
+        runs: List[float] = []
+
+        for _ in range(repeat):
+            if setup is not None:
+                setup()
+
+            start: float = perf_counter()
+
+            for _ in range(number):
+                task()
+
+            runs.append((perf_counter() - start) / number)
+
+        return {"median": median(runs), "min": min(runs), "runs": runs}
+
+    def RunCases(
+        self: Any, payload: Dict[str, Any], args: Namespace
+    ) -> Dict[str, Dict[str, Any]]:
+        """Time every benchmark case against the provided Store API response."""
+
+        results: Dict[str, Dict[str, Any]] = {}
+
+        def Case(name: str) -> bool:
+            return (args.cases is None) or (name in args.cases)
+
+        Benchmark.Prepare(self)
+
+        store: Dict[str, Any] = Emporium.ProcessStore(Emporium, payload["data"])
+        bundles: List[Bundle] = [b for v in store["sections"].values() for b in v]
+
+        if Case("ProcessStore"):
+            results["ProcessStore"] = Benchmark.Measure(
+                self,
+                lambda: Emporium.ProcessStore(Emporium, payload["data"]),
+                args.repeat,
+            )
+
+        if Case("PlanImage"):
+            results["PlanImage"] = Benchmark.Measure(
+                self,
+                lambda: Emporium.PlanImage(Emporium, store),
+                args.repeat,
+            )
+
+        if Case("BuildCard"):
+            Emporium.PrefetchImages(Emporium, bundles[:1])
+
+            font: Any = Utility.GetTTF(Emporium, 32, self.config["appearance"]["font"])
+
+            results["BuildCard"] = Benchmark.Measure(
+                self,
+                lambda: Emporium.BuildCard(Emporium, bundles[0], font),
+                args.repeat,
+            )
+
+        image: Optional[Image.Image] = None
+        incremental: bool = self.config.get("performance", {}).get("incremental")
+
+        if Case("BuildImage (cold)"):
+            results["BuildImage (cold)"] = Benchmark.Measure(
+                self,
+                lambda: Emporium.BuildImage(Emporium, store),
+                args.repeat,
+                partial(Benchmark.PrepareBuild, self, True),
+            )
+
+        if Case("BuildImage (warm)"):
+            Benchmark.PrepareBuild(self, False)
+
+            image = Emporium.BuildImage(Emporium, store)
+
+            results["BuildImage (warm)"] = Benchmark.Measure(
+                self,
+                lambda: Emporium.BuildImage(Emporium, store),
+                args.repeat,
+                partial(Benchmark.PrepareBuild, self, False),
+            )
+
+        if Case("BuildImage (incremental)"):
+            previous: Dict[str, Any] = Benchmark.RotateStore(self, store)
+
+            results["BuildImage (incremental)"] = Benchmark.Measure(
+                self,
+                lambda: Emporium.BuildImage(Emporium, store),
+                args.repeat,
+                partial(Benchmark.PrepareIncremental, self, previous),
+            )
+
+        # Restore the configured rendering for the remaining cases
+        Benchmark.PrepareBuild(self, False)
+
+        self.config["performance"]["incremental"] = incremental
+
+        if Case("CompressImage"):
+            if image is None:
+                image = Emporium.BuildImage(Emporium, store)
+
+            # Half of the lossless size ensures that the search is exercised
+            budget: int = len(Utility.EncodeImage(Emporium, image)) // 2
+
+            results["CompressImage"] = Benchmark.Measure(
+                self,
+                lambda: Utility.CompressImage(Emporium, image, budget),
+                args.repeat,
+                lambda: None,
+            )
+
+        for name, cold in [("Initialize (cold)", True), ("Initialize (warm)", False)]:
+            if Case(name):
+                results[name] = Benchmark.Measure(
+                    self,
+                    partial(Benchmark.RunInitialize, self),
+                    args.repeat,
+                    partial(Benchmark.PrepareInitialize, self, cold),
+                )
+
+        if Case("Startup (unchanged)"):
+            results["Startup (unchanged)"] = Benchmark.Measure(
+                self,
+                partial(Benchmark.RunStartup, self),
+                args.repeat,
+                partial(Benchmark.PrepareStartup, self, payload),
+            )
+
+        return results
+
+    def PrepareBuild(self: Any, cold: bool) -> None:
+        """
+        Prepare a full build of the Store image, which is only cold when
+        all state and cached cards are discarded. The previous image is
+        always discarded, so that it is never repainted incrementally.
+        """
+
+        if cold is True:
+            Benchmark.Prepare(self)
+
+        self.config.setdefault("performance", {})["incremental"] = False
+
+        for name in ["canvas", "layout"]:
+            if hasattr(Emporium, name) is True:
+                delattr(Emporium, name)
+
+    def PrepareIncremental(self: Any, previous: Dict[str, Any]) -> None:
+        """
+        Prepare an incremental build of the Store image by building the
+        provided previous Store, so that only its differences are repainted.
+        """
+
+        Benchmark.PrepareBuild(self, False)
+
+        self.config["performance"]["incremental"] = True
+
+        Emporium.BuildImage(Emporium, previous)
+
+    def RotateStore(self: Any, store: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Return a copy of the provided processed Store as it might have
+        been one update earlier, with a different date and the first two
+        Bundles of each section swapped.
+        """
+
+        sections: Dict[str, List[Bundle]] = {}
+
+        for name, bundles in store["sections"].items():
+            sections[name] = bundles[1::-1] + bundles[2:]
+
+        return {**store, "updateDate": "Yesterday", "sections": sections}
+
+    def PrepareInitialize(self: Any, cold: bool) -> None:
+        """
+        Prepare a full run of the application, which is only cold when the
+        cache and all state from the previous run are discarded.
+        """
+
+        if cold is True:
+            Benchmark.Reset(self)
+        else:
+            Utility.CloseClients(Emporium)
+
+        # A stale hash and no snapshot ensure that the Store is considered updated
+        Path("latest.txt").write_text("benchmark")
+        Path("latest_headers.json").unlink(missing_ok=True)
+        Path("latest_store.json").unlink(missing_ok=True)
+
+    def RunInitialize(self: Any) -> None:
+        """Run the application from start to finish."""
+
+        with redirect_stdout(StringIO()):
+            Emporium.Initialize(Emporium)
+
+    def PrepareStartup(self: Any, payload: Dict[str, Any]) -> None:
+        """
+        Prepare a run of the application in which the Store has not
+        updated since the previous run.
+        """
+
+        Benchmark.Reset(self)
+
+        Path("latest.txt").write_text(payload["data"]["hash"])
+        Path("latest_headers.json").unlink(missing_ok=True)
+
+    def RunStartup(self: Any) -> None:
+        """
+        Run the application in a fresh interpreter, so that the timing
+        includes its imports as a scheduled run would.
+        """
+
+        subprocess.run(
+            [sys.executable, str(Path(__file__).resolve().parent / "emporium.py")],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            check=True,
+        )
+
+    def PrintReport(
+        self: Any,
+        report: Dict[str, Any],
+        baseline: Optional[Dict[str, Any]],
+        threshold: float,
+    ) -> int:
+        """
+        Print the median timing of every case, compared to the baseline
+        report if provided, and return the number of regressions which
+        exceed the threshold.
+        """
+
+        regressions: int = 0
+        previous: Dict[str, Any] = (baseline or {}).get("results", {})
+
+        for payload, cases in report["results"].items():
+            print(f"\n{payload}")
+
+            for case, result in cases.items():
+                line: str = (
+                    f"    {case:<24}{Benchmark.FormatTime(self, result['median'])}"
+                )
+                before: Optional[Dict[str, Any]] = previous.get(payload, {}).get(case)
+
+                if before is not None:
+                    change: float = (result["median"] / before["median"]) - 1
+                    line += f"  {change:+8.1%}"
+
+                    if change > threshold:
+                        line += "  REGRESSION"
+                        regressions += 1
+
+                print(line)
+
+        if baseline is not None:
+            print(
+                f"\n{regressions:,} regressions exceeding {threshold:.0%} of the baseline"
+            )
+
+        return regressions
+
+    def FormatTime(self: Any, seconds: float) -> str:
+        """Return the provided duration in a human-readable format."""
+
+        if seconds >= 1:
+            return f"{seconds:10.2f}s "
+        elif seconds >= 0.001:
+            return f"{seconds * 1000:10.2f}ms"
+
+        return f"{seconds * 1000000:10.2f}us"
+
+
+if __name__ == "__main__":
+    parser: ArgumentParser = ArgumentParser(
+        description="Benchmark the Emporium render and publish paths offline."
+    )
+    parser.add_argument(
+        "--sizes",
+        nargs="+",
+        type=int,
+        default=[5, 30, 100],
+        help="numbers of Bundles in the synthetic Store payloads",
+    )
+    parser.add_argument(
+        "--payload",
+        action="append",
+        default=[],
+        help="recorded Store API response to replay (repeatable)",
+    )
+    parser.add_argument(
+        "--cases", nargs="+", help="only run the specified benchmark cases"
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="timings per case")
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.0,
+        help="seconds of simulated latency per stand-in request",
+    )
+    parser.add_argument(
+        "--webhooks", type=int, default=10, help="number of Discord webhooks"
+    )
+    parser.add_argument(
+        "--set",
+        action="append",
+        default=[],
+        metavar="KEY=JSON",
+        help="override a configuration value, such as performance.renderWorkers=1",
+    )
+    parser.add_argument(
+        "--assets",
+        default=str(Path(__file__).resolve().parent / "assets"),
+        help="directory containing the images and fonts",
+    )
+    parser.add_argument("--output", help="save the report to the specified file")
+    parser.add_argument("--baseline", help="compare against a previous report")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="relative slowdown considered a regression",
+    )
+    parser.add_argument(
+        "--startup-budget",
+        type=float,
+        default=1.0,
+        help="seconds allowed for a run in which the Store has not updated",
+    )
+    parser.add_argument("--verbose", action="store_true", help="show application logs")
+    args: Namespace = parser.parse_args()
+
+    if args.verbose is False:
+        logging.getLogger("emporium").setLevel(logging.WARNING)
+        logging.getLogger("utility").setLevel(logging.WARNING)
+
+    sys.exit(Benchmark.Initialize(Benchmark, args))
@@ -1,24 +1,98 @@
+from __future__ import annotations
+
+import hashlib
+import json
 import logging
+from argparse import ArgumentParser, Namespace
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timedelta
+from functools import partial
+from io import BytesIO
 from math import ceil
+from pathlib import Path
+from random import uniform
 from sys import exit
-from typing import Any, Dict, List, Optional, Tuple, Union
+from threading import Lock
+from time import perf_counter, sleep
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 
 import coloredlogs
-import praw
-import twitter
-from PIL import Image, ImageDraw
 
 from utility import Utility
 
+# Imaging and publishing libraries are imported by the stages which need them
+if TYPE_CHECKING:
+    import praw
+    import twitter
+    from PIL import Image
+
 log: logging.Logger = logging.getLogger(__name__)
 coloredlogs.install(level="INFO", fmt="[%(asctime)s] %(message)s", datefmt="%I:%M:%S")
 
+sessionLock: Lock = Lock()
+
+
+class Bundle:
+    """
+    A single Store Bundle, with the values needed by every stage computed
+    once when the Store is processed.
+    """
+
+    __slots__ = (
+        "id",
+        "name",
+        "slug",
+        "typeKey",
+        "section",
+        "price",
+        "priceText",
+        "url",
+        "billboard",
+        "logo",
+        "images",
+    )
+
+    def __init__(
+        self: Any, item: Dict[str, Any], section: str, endpoints: Dict[str, str]
+    ) -> None:
+        self.id: int = item.get("id")
+        self.name: str = item.get("name")
+        self.slug: str = item.get("slug")
+        self.typeKey: str = item.get("typeKey")
+        self.section: str = section
+        self.price: Union[int, str] = item.get("price")
+        self.priceText: str = f"{self.price:,}"
+        self.url: str = f"{endpoints['bundles']}{self.id}-{self.slug}"
+        self.billboard: str = item.get("billboard")
+        self.logo: str = item.get("logo")
+        self.images: Dict[str, str] = {
+            key: f"{endpoints['images']}{item.get(key)}.png"
+            for key in ["billboard", "logo"]
+        }
+
 
 class Emporium:
     """Call of Duty: Modern Warfare and Warzone Store generator."""
 
-    def Initialize(self: Any) -> None:
-        """Configure the application and begin its main functionality."""
+    def Initialize(
+        self: Any, daemon: bool = False, profiles: Optional[List[str]] = None
+    ) -> None:
+        """
+        Configure the application and begin its main functionality. When
+        profiles are configured, only those specified are run (or all of
+        them if none are specified).
+        """
 
         print("Emporium: Modern Warfare and Warzone Store Generator")
         print("https://github.com/EthanC/Emporium\n")
@@ -28,37 +102,366 @@ class Emporium:
 
         self.config: Dict[str, Any] = config
 
-        if (store := Emporium.GetStore(self)) is None:
+        if (loaded := Emporium.LoadProfiles(self, profiles)) is None:
+            return
+
+        self.profiles: List[Any] = loaded
+
+        # A single run only loads the assets once the Store has updated
+        if daemon is True:
+            Emporium.LoadAssets(self)
+
+        try:
+            if daemon is True:
+                Emporium.Daemon(self)
+            else:
+                Emporium.Run(self)
+        finally:
+            Utility.CloseClients(self)
+
+    def Daemon(self: Any) -> None:
+        """
+        Keep the application alive and poll the Store on the configured
+        interval, generating and sharing it whenever it has updated.
+        """
+
+        log.info("Running in daemon mode")
+
+        while True:
+            try:
+                Emporium.Run(self)
+            except Exception as e:
+                log.error(f"Failed to process the Store, {e}")
+
+            delay: float = Emporium.PollDelay(self)
+
+            log.debug(f"Polling the Store again in {delay:.0f}s")
+
+            sleep(delay)
+
+    def PollDelay(self: Any, now: Optional[datetime] = None) -> float:
+        """
+        Return the number of seconds to wait before polling the Store
+        again. Polling is faster within the configured window around the
+        daily reset and is offset by a random jitter.
+        """
+
+        daemon: Dict[str, Any] = self.config.get("daemon", {})
+        interval: float = daemon.get("interval", 300)
+        window: float = daemon.get("resetWindow", 600)
+        hour, minute = [int(i) for i in daemon.get("resetTime", "17:00").split(":")]
+
+        if now is None:
+            now = datetime.utcnow()
+
+        reset: datetime = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        distances: List[float] = [
+            (reset + timedelta(days=day) - now).total_seconds() for day in [-1, 0, 1]
+        ]
+
+        if min([abs(distance) for distance in distances]) <= window:
+            interval = daemon.get("resetInterval", 5)
+        else:
+            # Wake up in time for the start of the next reset window
+            until: float = min([d for d in distances if d > 0]) - window
+            interval = min(interval, max(until, 1))
+
+        jitter: float = interval * daemon.get("jitter", 0.1)
+
+        return max(interval + uniform(-jitter, jitter), 1)
+
+    def Run(self: Any) -> None:
+        """Generate and share the latest Store if it has updated."""
+
+        # Bundle images are only kept for the duration of a run
+        self.images: Dict[str, bytes] = {}
+
+        if len(getattr(self, "profiles", [])) > 0:
+            Emporium.RunProfiles(self)
+        else:
+            Emporium.Generate(self)
+
+    def Generate(self: Any) -> None:
+        """
+        Generate and share the latest Store for a single configuration if
+        it has updated, recording the metrics of the run.
+        """
+
+        Utility.StartMetrics(self)
+
+        try:
+            Emporium.RunStages(self)
+        except Exception:
+            Utility.RecordMetric(self, "status", "failed")
+
+            raise
+        finally:
+            Utility.SaveMetrics(self)
+
+    def RunStages(self: Any) -> None:
+        """
+        Run each stage of generating and sharing the latest Store, recording
+        the duration of every stage in the metrics of the current run.
+        """
+
+        Stage: Callable[..., Any] = partial(Utility.MeasureStage, self)
+
+        Stage("DrainQueue", partial(Emporium.DrainQueue, self))
+
+        if (store := Stage("GetStore", partial(Emporium.GetStore, self))) is None:
             return
 
         store: Dict[str, Any] = store
 
-        if Emporium.DiffStore(self, store) is False:
+        if Stage("DiffStore", partial(Emporium.DiffStore, self, store)) is False:
             return
 
-        store = Emporium.ProcessStore(self, store)
+        store = Stage("ProcessStore", partial(Emporium.ProcessStore, self, store))
 
         if store is None:
+            Utility.RecordMetric(self, "status", "rejected")
+
             return
 
-        image: bool = Emporium.BuildImage(self, store)
+        # Profiles have already compared the Store before rendering cards
+        if (diff := getattr(self, "storeDiff", None)) is None:
+            diff = Stage("CompareStore", partial(Emporium.CompareStore, self, store))
+
+        Utility.RecordMetric(self, "change", diff["kind"])
+
+        if Emporium.DiffPolicy(self, diff) is False:
+            Utility.RecordMetric(self, "status", "skipped")
+
+            if self.config.get("archive", {}).get("enabled", False) is True:
+                Stage(
+                    "ArchiveStore", partial(Emporium.ArchiveStore, self, store, False)
+                )
+
+            Emporium.SaveHash(self, store.get("hash"))
+
+            log.info(f"Skipped publishing the Store ({diff['kind']})")
 
-        if image is not True:
             return
 
-        if self.config["thirdParties"]["twitter"].get("enabled") is True:
-            Emporium.ShareTwitter(self, store)
+        if getattr(self, "assets", None) is None:
+            Emporium.LoadAssets(self)
 
-        if self.config["thirdParties"]["discord"].get("enabled") is True:
-            Emporium.ShareDiscord(self, store)
+        renderMode: str = self.config.get("performance", {}).get("renderMode", "canvas")
 
-        if self.config["thirdParties"]["reddit"].get("enabled") is True:
-            Emporium.ShareReddit(self, store)
+        if renderMode == "stream":
+            image: Optional[bytes] = Stage(
+                "StreamImage", partial(Emporium.StreamImage, self, store)
+            )
+        else:
+            image: Optional[Image.Image] = Stage(
+                "BuildImage", partial(Emporium.BuildImage, self, store)
+            )
 
-        Utility.WriteFile(self, "latest.txt", store.get("hash"))
+        if image is None:
+            return
+
+        Stage("EncodeImage", partial(Emporium.EncodeImage, self, image))
+
+        Utility.SaveCache(self)
+
+        if self.config.get("archive", {}).get("enabled", False) is True:
+            Stage("ArchiveStore", partial(Emporium.ArchiveStore, self, store))
+
+        Stage("Publish", partial(Emporium.Publish, self, store))
+
+        Utility.RecordMetric(self, "status", "published")
+        Utility.RecordMetric(
+            self, "timeToPublish", Utility.SecondsSince(self, store.get("lastUpdated"))
+        )
+
+        Emporium.SaveHash(self, store.get("hash"))
+        Emporium.SaveSnapshot(self, store)
 
         log.info("Saved the latest Store hash")
 
+    def LoadProfiles(
+        self: Any, names: Optional[List[str]] = None
+    ) -> Optional[List[Any]]:
+        """
+        Return a generator for each configured profile, optionally only
+        those with the specified names. Each profile is a subclass of the
+        application which shares its assets, clients, and cache, but uses
+        the configuration merged with the overrides of the profile and
+        keeps its output in its own directory. Return None if any of the
+        specified names is not a configured profile.
+        """
+
+        profiles: List[Any] = []
+
+        for profile in self.config.get("profiles", []):
+            name: str = profile.get("name")
+
+            if (names is not None) and (name not in names):
+                continue
+
+            directory: str = profile.get("directory", f"profiles/{name}/")
+            overrides: Dict[str, Any] = {
+                key: value
+                for key, value in profile.items()
+                if key not in ["name", "directory"]
+            }
+
+            config: Dict[str, Any] = Utility.MergeConfig(self, self.config, overrides)
+            config.pop("profiles", None)
+
+            Path(directory).mkdir(parents=True, exist_ok=True)
+
+            profiles.append(
+                type(
+                    f"{self.__name__}[{name}]",
+                    (self,),
+                    {
+                        "config": config,
+                        "profile": name,
+                        "directory": directory,
+                        "profiles": [],
+                    },
+                )
+            )
+
+        unknown: List[str] = sorted(
+            set(names or []) - set([p.profile for p in profiles])
+        )
+
+        for name in unknown:
+            log.error(f"Failed to load profile {name}, it is not configured")
+
+        if len(unknown) > 0:
+            return
+
+        if len(profiles) > 0:
+            log.info(f"Loaded {len(profiles):,} profiles")
+
+        return profiles
+
+    def RunProfiles(self: Any) -> None:
+        """
+        Generate and share the latest Store for every profile. The Store
+        is fetched once per endpoint, and the Bundle images and cards are
+        prepared once for the profiles which will publish it, before each
+        profile renders and publishes its own Store image concurrently.
+        The metrics of these shared stages are recorded for the batch.
+        """
+
+        self.responses: Dict[str, Tuple[int, Any, Dict[str, str]]] = {}
+        self.sharedCards: Dict[str, Image.Image] = {}
+
+        try:
+            Utility.StartMetrics(self)
+            Utility.RecordMetric(self, "status", "batch")
+            Utility.RecordMetric(self, "profiles", [p.profile for p in self.profiles])
+
+            try:
+                Emporium.PrepareProfiles(self)
+            except Exception:
+                Utility.RecordMetric(self, "status", "failed")
+
+                raise
+            finally:
+                Utility.SaveMetrics(self)
+
+            results: Dict[str, Dict[str, Any]] = Utility.RunConcurrently(
+                self,
+                {p.profile: partial(Emporium.Generate, p) for p in self.profiles},
+                workers=len(self.profiles),
+            )
+        finally:
+            self.responses = None
+            self.sharedCards = None
+
+            for profile in self.profiles:
+                profile.storeDiff = None
+
+        for name, result in results.items():
+            if result.get("success") is not True:
+                log.error(f"Failed to run profile {name}, {result.get('error')}")
+
+    def PrepareProfiles(self: Any) -> None:
+        """
+        Fetch the Store once per endpoint, then prefetch the Bundle images
+        and render the cards once for the profiles which will publish it,
+        recording each stage in the metrics of the batch.
+        """
+
+        Stage: Callable[..., Any] = partial(Utility.MeasureStage, self)
+        groups: Dict[str, List[Any]] = {}
+        pending: Dict[str, List[Any]] = {}
+
+        for profile in self.profiles:
+            groups.setdefault(Emporium.StoreEndpoint(profile), []).append(profile)
+
+        for endpoint, group in groups.items():
+            # Validators may only be shared if every profile saved the same
+            saved: List[Dict[str, str]] = [
+                Emporium.LoadValidators(profile) for profile in group
+            ]
+            validators: Dict[str, str] = saved[0]
+
+            if any([v != validators for v in saved]) is True:
+                validators = {}
+
+            response: Tuple[int, Any, Dict[str, str]] = Stage(
+                "GetStore",
+                partial(Utility.ConditionalGET, self, endpoint, validators),
+            )
+            self.responses[endpoint] = response
+
+            if (data := response[1]) is None:
+                continue
+
+            store: Dict[str, Any] = data.get("data")
+
+            for profile in group:
+                if Emporium.LocalHash(profile) in [None, store.get("hash")]:
+                    continue
+
+                font: str = profile.config["appearance"].get("font")
+                sections, _ = Emporium.ClassifyBundles(profile, store["items"])
+
+                # Profiles which will skip publishing need no images or cards
+                profile.storeDiff = Emporium.CompareStore(
+                    profile, {"sections": sections}
+                )
+
+                if Emporium.DiffPolicy(profile, profile.storeDiff) is False:
+                    continue
+
+                for bundles in sections.values():
+                    pending.setdefault(font, [profile, []])[1].extend(bundles)
+
+        if (len(pending) > 0) and (getattr(self, "assets", None) is None):
+            Emporium.LoadAssets(self)
+
+        if len(pending) > 0:
+            Stage(
+                "PrefetchImages",
+                partial(
+                    Emporium.PrefetchImages,
+                    self,
+                    [b for _, bundles in pending.values() for b in bundles],
+                ),
+            )
+
+        # Cards only differ by font, so render each set of cards once,
+        # recording them in the metrics of the batch
+        for profile, bundles in pending.values():
+            profile.metrics = self.metrics
+
+            try:
+                Emporium.RenderCards(profile, bundles)
+            finally:
+                profile.metrics = None
+
+    def OutputPath(self: Any, filename: str) -> str:
+        """Return the path of the specified output file for this profile."""
+
+        return str(Path(getattr(self, "directory", "")) / filename)
+
     def LoadConfiguration(self: Any) -> Optional[Dict[str, Any]]:
         """Load the configurable values from config.json"""
 
@@ -69,254 +472,1081 @@ class Emporium:
 
             return config
 
+    def LoadAssets(self: Any) -> None:
+        """
+        Decode the image assets and the configured font sizes once so that
+        they remain in memory for the lifetime of the process.
+        """
+
+        count: int = Utility.LoadAssets(self)
+        fontName: str = self.config["appearance"].get("font")
+
+        for size in [72, 32]:
+            Utility.GetTTF(self, size, fontName)
+
+        log.info(f"Loaded {count:,} image assets and the {fontName} font")
+
     def GetStore(self: Any) -> Optional[Dict[str, Any]]:
         """
         Fetch the latest Store data for Modern Warfare and Warzone from
         the Tracker Network API.
         """
 
-        data: Optional[Any] = Utility.GET(
-            self, "https://api.tracker.gg/api/v1/modern-warfare/store"
+        endpoint: str = Emporium.StoreEndpoint(self)
+        responses: Optional[Dict[str, Any]] = getattr(self, "responses", None)
+
+        # Profiles share the response which was already fetched for them
+        if (responses is not None) and (endpoint in responses):
+            status, data, self.validators = responses[endpoint]
+        else:
+            status, data, self.validators = Utility.ConditionalGET(
+                self, endpoint, Emporium.LoadValidators(self)
+            )
+
+        # HTTP 304 Not Modified
+        if status == 304:
+            log.info("The Store has not updated, the API responded Not Modified")
+
+            return None
+        elif data is None:
+            return None
+
+        store: Dict[str, Any] = data.get("data")
+        updateDate: str = Utility.ISOtoHumanDate(self, store.get("lastUpdated"))
+        updateTime: str = Utility.ISOtoHumanTime(self, store.get("lastUpdated"))
+
+        log.info(f"Fetched the Store for {updateDate} at {updateTime} UTC")
+
+        return store
+
+    def StoreEndpoint(self: Any) -> str:
+        """Return the configured URL of the Store API."""
+
+        return self.config.get("endpoints", {}).get(
+            "store", "https://api.tracker.gg/api/v1/modern-warfare/store"
         )
 
-        if data is None:
+    def LoadValidators(self: Any) -> Dict[str, str]:
+        """Return the HTTP validators of the last saved Store response."""
+
+        # Validators are only trusted alongside the hash they were saved with
+        if Utility.FileExists(self, Emporium.OutputPath(self, "latest.txt")) is False:
+            return {}
+
+        path: str = Emporium.OutputPath(self, "latest_headers.json")
+
+        if Utility.FileExists(self, path) is False:
+            return {}
+
+        return Utility.ReadFile(self, path) or {}
+
+    def LocalHash(self: Any) -> Optional[str]:
+        """Return the hash of the last saved Store, if one exists."""
+
+        path: str = Emporium.OutputPath(self, "latest.txt")
+
+        if Utility.FileExists(self, path) is False:
             return None
 
-        store: Dict[str, Any] = data.get("data")
-        updateDate: str = Utility.ISOtoHumanDate(self, store.get("lastUpdated"))
-        updateTime: str = Utility.ISOtoHumanTime(self, store.get("lastUpdated"))
+        return Utility.ReadFile(self, path)
+
+    def DiffStore(self: Any, store: Dict[str, Any]) -> bool:
+        """
+        Determine if the Modern Warfare and Warzone Store has updated
+        since the last time the application was ran.
+        """
+
+        apiHash: str = store.get("hash")
+
+        if (localHash := Emporium.LocalHash(self)) is None:
+            Emporium.SaveHash(self, apiHash)
+
+            log.warning("No local Store hash found, created it")
+
+            return False
+
+        if localHash == apiHash:
+            # Refresh the validators so that the next request may be skipped
+            Emporium.SaveHash(self, apiHash)
+
+            log.info("The Store has not updated, the local hash matches the API hash")
+
+            return False
+        else:
+            return True
+
+    def CompareStore(self: Any, store: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Compare the Bundles of the processed Store with those of the last
+        published Store, returning the IDs of the Bundles which were added,
+        removed, or changed (with the names of their changed fields), and
+        the kind of change: unchanged, metadata, price, or rotation.
+        """
+
+        snapshot: Optional[Dict[str, Any]] = None
+        path: str = Emporium.OutputPath(self, "latest_store.json")
+
+        if Utility.FileExists(self, path) is True:
+            snapshot = Utility.ReadFile(self, path)
+
+        current: Dict[int, Dict[str, Any]] = {
+            record["id"]: record for record in Emporium.SnapshotBundles(self, store)
+        }
+
+        # Without a snapshot, every Bundle is considered new
+        previous: Dict[int, Dict[str, Any]] = {
+            record["id"]: record for record in (snapshot or {}).get("bundles", [])
+        }
+
+        changed: Dict[int, List[str]] = {}
+
+        for bundleId, record in current.items():
+            if (before := previous.get(bundleId)) is None:
+                continue
+
+            fields: List[str] = [k for k, v in record.items() if before.get(k) != v]
+
+            if len(fields) > 0:
+                changed[bundleId] = fields
+
+        diff: Dict[str, Any] = {
+            "added": [i for i in current if i not in previous],
+            "removed": [i for i in previous if i not in current],
+            "changed": changed,
+            "reordered": [i for i in current if i in previous]
+            != [i for i in previous if i in current],
+        }
+
+        changes: Set[str] = set([f for v in changed.values() for f in v])
+        moved: bool = (len(diff["added"]) + len(diff["removed"])) > 0
+
+        # Cards show the price and images, and their order and section
+        if (moved is True) or (diff["reordered"] is True):
+            diff["kind"] = "rotation"
+        elif len(changes & {"section", "billboard", "logo"}) > 0:
+            diff["kind"] = "rotation"
+        elif "price" in changes:
+            diff["kind"] = "price"
+        elif len(changes) > 0:
+            diff["kind"] = "metadata"
+        else:
+            diff["kind"] = "unchanged"
+
+        log.info(
+            f"Compared the Store, {len(diff['added']):,} added, {len(diff['removed']):,} removed, and {len(changed):,} changed Bundles ({diff['kind']})"
+        )
+
+        return diff
+
+    def DiffPolicy(self: Any, diff: Dict[str, Any]) -> bool:
+        """
+        Return a boolean value indicating whether or not a Store with the
+        provided changes should be rendered and published.
+        """
+
+        skip: List[str] = self.config.get("publishing", {}).get(
+            "skipChanges", ["unchanged"]
+        )
+
+        return diff["kind"] not in skip
+
+    def SnapshotBundles(self: Any, store: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Return the fields of each Bundle which are compared between Stores."""
+
+        return [
+            {
+                "id": bundle.id,
+                "section": bundle.section,
+                "price": bundle.price,
+                "billboard": bundle.billboard,
+                "logo": bundle.logo,
+                "name": bundle.name,
+                "slug": bundle.slug,
+            }
+            for bundles in store.get("sections").values()
+            for bundle in bundles
+        ]
+
+    def SaveSnapshot(self: Any, store: Dict[str, Any]) -> None:
+        """Save the Bundles of the published Store for the next comparison."""
+
+        Utility.WriteFile(
+            self,
+            Emporium.OutputPath(self, "latest_store.json"),
+            {
+                "hash": store.get("hash"),
+                "bundles": Emporium.SnapshotBundles(self, store),
+            },
+            compress=True,
+        )
+
+    def SaveHash(self: Any, apiHash: str) -> None:
+        """
+        Save the provided Store hash alongside the HTTP validators of the
+        response which it was fetched from.
+        """
+
+        Utility.WriteFile(self, Emporium.OutputPath(self, "latest.txt"), apiHash)
+        Utility.WriteFile(
+            self,
+            Emporium.OutputPath(self, "latest_headers.json"),
+            getattr(self, "validators", {}),
+        )
+
+    def ProcessStore(self: Any, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Process and return the Store API response."""
+
+        sections, unknown = Emporium.ClassifyBundles(self, data.get("items"))
+
+        for typeKey in unknown:
+            log.warning(f"Unknown Bundle typeKey found: {typeKey}")
+
+        if any([len(bundles) == 0 for bundles in sections.values()]) is True:
+            if self.config["preferences"].get("verify") is True:
+                counts: str = ", ".join(
+                    [f"{name}: {len(bundles):,}" for name, bundles in sections.items()]
+                )
+
+                log.error(f"Failed to process the Store ({counts})")
+
+                return None
+
+        return {
+            "updateDate": Utility.ISOtoHumanDate(self, data.get("lastUpdated")),
+            "updateTime": Utility.ISOtoHumanTime(self, data.get("lastUpdated")),
+            "lastUpdated": data.get("lastUpdated"),
+            "hash": data.get("hash"),
+            "sections": sections,
+        }
+
+    def ClassifyBundles(
+        self: Any, items: List[Dict[str, Any]]
+    ) -> Tuple[Dict[str, List[Bundle]], Set[str]]:
+        """
+        Build the record of every Bundle in a single pass, grouped into
+        the sections configured for their typeKey, and return them along
+        with any typeKeys which have no section.
+        """
+
+        table: Dict[str, str] = self.config.get(
+            "sections",
+            {
+                "FEATURED": "Featured",
+                "OPERATOR": "Operators & Identity",
+                "WEAPON": "Blueprints",
+            },
+        )
+        endpoints: Dict[str, str] = {
+            "images": "https://titles.trackercdn.com/modern-warfare/db/images/",
+            "bundles": "https://cod.tracker.gg/warzone/db/bundles/",
+            **self.config.get("endpoints", {}),
+        }
+
+        sections: Dict[str, List[Bundle]] = {name: [] for name in table.values()}
+        unknown: Set[str] = set()
+
+        for item in items:
+            typeKey: str = item.get("typeKey")
+
+            if (section := table.get(typeKey)) is None:
+                unknown.add(typeKey)
+
+                continue
+
+            sections[section].append(Bundle(item, section, endpoints))
+
+        return (sections, unknown)
+
+    def ArchiveStore(self: Any, store: Dict[str, Any], rendered: bool = True) -> None:
+        """
+        Record the processed Store, and its image if it was rendered, in the
+        local archive. The image is saved under the hash of the Store, as
+        store.png is replaced by the next Store. Failing to do so is logged
+        rather than raised, so that the Store is still published.
+        """
+
+        from archive import Archive
+
+        database: str = self.config["archive"].get("path", "archive.db")
+        directory: str = self.config["archive"].get("images", "archive/")
+        profile: Optional[str] = getattr(self, "profile", None)
+        image: Optional[str] = None
+
+        try:
+            if rendered is True:
+                suffix: str = "" if profile is None else f"_{profile}"
+                path: Path = Path(directory) / f"{store.get('hash')}{suffix}.png"
+
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_bytes(self.artifacts["store.png"])
+
+                image = str(path.resolve())
+
+            Archive.SaveStore(self, database, store, image, profile)
+        except Exception as e:
+            log.error(f"Failed to archive the Store in {database}, {e}")
+
+            return
+
+        log.info(f"Archived the Store in {database}")
+
+    def PrefetchImages(self: Any, bundles: List[Bundle]) -> None:
+        """
+        Concurrently download the billboard and logo images for each of
+        the provided Bundles ahead of generating their cards.
+        """
+
+        existing: Dict[str, bytes] = getattr(self, "images", None) or {}
+        urls: List[str] = []
+
+        for bundle in bundles:
+            for url in bundle.images.values():
+                if (url not in urls) and (url not in existing):
+                    urls.append(url)
+
+        if len(urls) == 0:
+            return
+
+        limit: int = self.config.get("performance", {}).get("downloadConcurrency", 16)
+
+        start: float = perf_counter()
+        images, size = Utility.DownloadImages(self, urls, limit)
+        elapsed: float = perf_counter() - start
+
+        self.images: Dict[str, bytes] = {**existing, **images}
+
+        log.info(
+            f"Prefetched {len(images):,}/{len(urls):,} Bundle images ({size:,} bytes downloaded) in {elapsed:.2f}s"
+        )
+
+    def GetBundleImage(self: Any, bundle: Bundle, key: str) -> Image.Image:
+        """
+        Return the image object for the specified image of the provided
+        Bundle, preferring the prefetched contents when available.
+        """
+
+        url: str = bundle.images[key]
+        data: Optional[bytes] = getattr(self, "images", {}).get(url)
+
+        if data is None:
+            return Utility.DownloadImage(self, url)
+
+        return Utility.DecodeImage(self, data)
+
+    def BuildImage(self: Any, data: Dict[str, Any]) -> Optional[Image.Image]:
+        """Generate a stylized image for the provided Store data."""
+
+        from PIL import Image, ImageDraw
+
+        background: Tuple[int, int, int] = tuple(
+            self.config["appearance"].get("background")
+        )
+        text: Tuple[int, int, int] = tuple(self.config["appearance"].get("text"))
+
+        fontName: str = self.config["appearance"].get("font")
+        font72 = Utility.GetTTF(self, 72, fontName)
+
+        table, slots = Emporium.PlanImage(self, data)
+        dimensions: List[int] = table["dimensions"]
+        cardWidth, cardHeight = table["card"]
+
+        # The Store image is opaque, so the alpha channel may be omitted
+        renderMode: str = self.config.get("performance", {}).get("renderMode")
+        mode: str = "RGB" if renderMode == "rgb" else "RGBA"
+
+        prettyDate: str = data.get("updateDate")
+        layout: Dict[str, Any] = {
+            "mode": mode,
+            "dimensions": list(dimensions),
+            "appearance": self.config["appearance"],
+            "date": prettyDate,
+            "headers": table["headers"],
+            # Replacing the game logo or font must repaint the whole header
+            "assets": [
+                [path.name, path.stat().st_mtime]
+                for path in [
+                    Path("assets/images/game_logo.png"),
+                    Path(f"assets/fonts/{fontName}.ttf"),
+                ]
+                if path.is_file()
+            ],
+            "cards": {
+                f"{x},{y}": Emporium.CardKey(self, bundle)
+                for bundle, (x, y, _, _) in slots
+            },
+        }
+
+        # The date is repainted in the band between the game logo and the
+        # first header or card, which must hold both the old and new dates
+        dateBand: List[int] = [0, 255, dimensions[0], dimensions[1]]
+
+        for _, _, y in table["headers"]:
+            dateBand[3] = min(dateBand[3], y)
+
+        for _, box in slots:
+            dateBand[3] = min(dateBand[3], box[1])
+
+        previous: Optional[Tuple[Image.Image, Dict[str, Any]]] = None
+
+        if (last := Emporium.PreviousImage(self)) is not None:
+            dates: List[str] = [last[1].get("date") or "", prettyDate]
+            dateBottom: int = 275 + max([font72.getsize(d)[1] for d in dates])
+
+            if all(
+                [
+                    last[1].get(k) == layout[k]
+                    for k in ["mode", "dimensions", "appearance", "headers", "assets"]
+                ]
+            ) and (dateBottom <= dateBand[3]):
+                previous = last
+
+        # Discard the in-memory canvas while it is being modified
+        self.canvas: Optional[Image.Image] = None
+
+        if previous is not None:
+            store: Image.Image = previous[0]
+            canvas: Any = ImageDraw.Draw(store)
+
+            if previous[1].get("date") != prettyDate:
+                store.paste(background, tuple(dateBand))
+
+                textWidth, _ = font72.getsize(prettyDate)
+                canvas.text(
+                    Utility.CenterX(self, textWidth, store.width, 275),
+                    prettyDate,
+                    text,
+                    font72,
+                )
+
+            # Clear card slots which are no longer occupied
+            for position in previous[1].get("cards", {}).keys():
+                if position not in layout["cards"]:
+                    x, y = [int(i) for i in position.split(",")]
+
+                    store.paste(background, (x, y, x + cardWidth, y + cardHeight))
+
+            dirty: List[Tuple[Bundle, List[int]]] = [
+                (bundle, box)
+                for bundle, box in slots
+                if previous[1].get("cards", {}).get(f"{box[0]},{box[1]}")
+                != layout["cards"][f"{box[0]},{box[1]}"]
+            ]
+        else:
+            store: Image.Image = Image.new(mode, (dimensions[0], dimensions[1]))
+            canvas: Any = ImageDraw.Draw(store)
+
+            store.paste(background, (0, 0, store.width, store.height))
+
+            gameLogo: Image.Image = Utility.GetAsset(self, "game_logo.png")
+            gameLogo = Utility.ResizeImage(self, gameLogo, width=1000)
+            store.paste(
+                gameLogo,
+                Utility.CenterX(self, gameLogo.width, store.width, 50),
+                gameLogo,
+            )
+
+            textWidth, _ = font72.getsize(prettyDate)
+            canvas.text(
+                Utility.CenterX(self, textWidth, store.width, 275),
+                prettyDate,
+                text,
+                font72,
+            )
+
+            for title, x, y in table["headers"]:
+                canvas.text((x, y), title, text, font72)
+
+            dirty: List[Tuple[Bundle, List[int]]] = slots
+
+        cards: Dict[str, Image.Image] = Emporium.RenderCards(
+            self, [bundle for bundle, _ in dirty]
+        )
+
+        for bundle, box in dirty:
+            card: Image.Image = cards[layout["cards"][f"{box[0]},{box[1]}"]]
+
+            if previous is not None:
+                store.paste(background, tuple(box))
+
+            store.paste(card, (box[0], box[1]), card)
+
+        if self.config.get("performance", {}).get("incremental", False) is True:
+            self.canvas: Optional[Image.Image] = store
+            self.layout: Dict[str, Any] = layout
+
+        if previous is not None:
+            log.info(
+                f"Generated the Store image, repainted {len(dirty):,}/{len(slots):,} cards"
+            )
+        else:
+            log.info("Generated the Store image")
+
+        return store
+
+    def PlanImage(
+        self: Any, data: Dict[str, Any]
+    ) -> Tuple[Dict[str, Any], List[Tuple[Bundle, List[int]]]]:
+        """
+        Return the placement table of the Store image along with each
+        Bundle and the box of its card.
+        """
+
+        sections: Dict[str, List[Bundle]] = data.get("sections")
+
+        table: Dict[str, Any] = Emporium.LayoutImage(
+            self, {name: len(bundles) for name, bundles in sections.items()}
+        )
+        bundles: List[Bundle] = [b for bundles in sections.values() for b in bundles]
+
+        return (table, list(zip(bundles, table["cards"])))
+
+    def LayoutImage(
+        self: Any, counts: Dict[str, int], columns: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Compute the placement table of the Store image from the number of
+        Bundles in each section and the configured grid: its dimensions,
+        the position of each section header, and the box of each card in
+        order. When the columns are set to auto, the number of columns
+        which best matches the configured aspect ratio is used.
+        """
+
+        grid: Dict[str, Any] = self.config.get("layout", {})
+        margin: int = grid.get("margin", 50)
+        top: int = grid.get("top", 500)
+        headerHeight: int = grid.get("headerHeight", 75)
+        cardWidth, cardHeight = Utility.GetAsset(self, "card_container.png").size
+
+        if columns is None:
+            columns = grid.get("columns", 2)
+
+        if columns == "auto":
+            ratio: float = grid.get("aspectRatio", 16 / 9)
+            candidates: int = min(
+                max(counts.values(), default=1), grid.get("maxColumns", 8)
+            )
+
+            tables: List[Dict[str, Any]] = [
+                Emporium.LayoutImage(self, counts, i)
+                for i in range(1, max(candidates, 1) + 1)
+            ]
+
+            # Compare the aspect ratios so that an image twice as wide as
+            # the target is equally as distant as one twice as tall
+            def Distance(table: Dict[str, Any]) -> float:
+                width, height = table["dimensions"]
+
+                return max((width / height) / ratio, ratio / (width / height))
+
+            return min(tables, key=Distance)
+
+        headers: List[List[Union[str, int]]] = []
+        cards: List[List[int]] = []
+        sectionX: int = 0
+        rows: int = 0
+
+        for name, count in counts.items():
+            if count == 0:
+                continue
+
+            headers.append([name, sectionX + margin, top])
+
+            for i in range(count):
+                cardX: int = sectionX + margin + (i % columns) * (cardWidth + margin)
+                cardY: int = (
+                    top + headerHeight + margin + (i // columns) * (cardHeight + margin)
+                )
+                cards.append([cardX, cardY, cardX + cardWidth, cardY + cardHeight])
+
+            sectionX += columns * (cardWidth + margin)
+            rows = max(rows, ceil(count / columns))
+
+        return {
+            "dimensions": [
+                sectionX + margin,
+                top + headerHeight + (rows * (cardHeight + margin)) + margin,
+            ],
+            "columns": columns,
+            "card": [cardWidth, cardHeight],
+            "headers": headers,
+            "cards": cards,
+        }
+
+    def StreamImage(self: Any, data: Dict[str, Any]) -> Optional[bytes]:
+        """
+        Generate the Store image one band (row of cards) at a time and
+        incrementally encode it as a PNG, so that the full canvas is never
+        held in memory. When Twitter is enabled, each band is also
+        downscaled into a preview no larger than the configured number of
+        pixels, from which the compressed variant is encoded.
+        """
+
+        from PIL import Image, ImageDraw
+
+        background: Tuple[int, int, int] = tuple(
+            self.config["appearance"].get("background")
+        )
+        text: Tuple[int, int, int] = tuple(self.config["appearance"].get("text"))
+
+        fontName: str = self.config["appearance"].get("font")
+        font72 = Utility.GetTTF(self, 72, fontName)
+
+        table, slots = Emporium.PlanImage(self, data)
+        width, height = table["dimensions"]
+
+        gameLogo: Image.Image = Utility.GetAsset(self, "game_logo.png")
+        gameLogo = Utility.ResizeImage(self, gameLogo, width=1000)
+
+        prettyDate: str = data.get("updateDate")
+        textWidth, _ = font72.getsize(prettyDate)
+
+        texts: List[Tuple[str, Tuple[int, int]]] = [
+            (prettyDate, Utility.CenterX(self, textWidth, width, 275)),
+            *[(title, (x, y)) for title, x, y in table["headers"]],
+        ]
+
+        # Each band begins at a row of cards, the first band holds the header
+        edges: List[int] = sorted(set([0, height] + [box[1] for _, box in slots]))
+
+        def Bands() -> Iterable[Image.Image]:
+            for bandY, bandEnd in zip(edges, edges[1:]):
+                band: Image.Image = Image.new(
+                    "RGB", (width, bandEnd - bandY), background
+                )
+                canvas: Any = ImageDraw.Draw(band)
+
+                if bandY < 50 + gameLogo.height:
+                    x, y = Utility.CenterX(self, gameLogo.width, width, 50)
+                    band.paste(gameLogo, (x, y - bandY), gameLogo)
+
+                for value, (x, y) in texts:
+                    canvas.text((x, y - bandY), value, text, font72)
+
+                row: List[Tuple[Bundle, List[int]]] = [
+                    (bundle, box) for bundle, box in slots if box[1] == bandY
+                ]
+                if len(row) == 0:
+                    yield band
+
+                    continue
+
+                cards: Dict[str, Image.Image] = Emporium.RenderCards(
+                    self, [bundle for bundle, _ in row], executor
+                )
+
+                for bundle, (x, y, _, _) in row:
+                    card: Image.Image = cards[Emporium.CardKey(self, bundle)]
+                    band.paste(card, (x, y - bandY), card)
+
+                yield band
+
+        preview: Optional[Image.Image] = None
+        scale: float = 1.0
+
+        if self.config["thirdParties"]["twitter"].get("enabled") is True:
+            pixels: int = self.config.get("performance", {}).get(
+                "previewPixels", 8388608
+            )
+            scale = min(1.0, (pixels / (width * height)) ** 0.5)
+            preview = Image.new(
+                "RGB",
+                (max(int(width * scale), 1), max(int(height * scale), 1)),
+                background,
+            )
+
+        def Preview(bands: Iterable[Image.Image]) -> Iterable[Image.Image]:
+            for bandY, band in zip(edges, bands):
+                top: int = round(bandY * scale)
+                bottom: int = min(round((bandY + band.height) * scale), preview.height)
+
+                if bottom > top:
+                    preview.paste(
+                        band.resize((preview.width, bottom - top), Image.ANTIALIAS),
+                        (0, top),
+                    )
+
+                yield band
+
+        # Download every uncached card's images up front, so that each band
+        # reuses one executor rather than creating its own
+        shared: Dict[str, Image.Image] = getattr(self, "sharedCards", None) or {}
+        pending: List[Bundle] = []
+
+        for bundle, _ in slots:
+            key: str = Emporium.CardKey(self, bundle)
+
+            if (key not in shared) and (Utility.CacheEntry(self, "cards", key) is None):
+                pending.append(bundle)
+
+        executor: Optional[Executor] = None
+
+        if len(pending) > 0:
+            Emporium.PrefetchImages(self, pending)
+
+        if len(pending) > 1:
+            executor = Emporium.RenderExecutor(self)
+
+        try:
+            image: bytes = Utility.StreamPNG(
+                self,
+                (width, height),
+                Bands() if preview is None else Preview(Bands()),
+            )
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        self.preview: Optional[Image.Image] = preview
 
-        log.info(f"Fetched the Store for {updateDate} at {updateTime} UTC")
+        log.info(f"Generated the Store image in {len(edges) - 1:,} bands")
 
-        return store
+        return image
 
-    def DiffStore(self: Any, store: Dict[str, Any]) -> bool:
+    def PreviousImage(self: Any) -> Optional[Tuple[Image.Image, Dict[str, Any]]]:
         """
-        Determine if the Modern Warfare and Warzone Store has updated
-        since the last time the application was ran.
+        Return the previously generated Store image and its layout, from
+        memory or from the cache, if incremental rendering is enabled.
         """
 
-        apiHash: str = store.get("hash")
+        from PIL import Image
 
-        if Utility.FileExists(self, "latest.txt") is False:
-            Utility.WriteFile(self, "latest.txt", apiHash)
+        if self.config.get("performance", {}).get("incremental", False) is not True:
+            return
 
-            log.warning("No local Store hash found, created it")
+        if getattr(self, "canvas", None) is not None:
+            return (self.canvas, self.layout)
 
-            return False
+        layoutKey: str = Emporium.OutputPath(self, "layout.json")
+        canvasKey: str = Emporium.OutputPath(self, "canvas.png")
 
-        localHash: str = Utility.ReadFile(self, "latest.txt")
+        if (layout := Utility.ReadCache(self, "render", layoutKey)) is None:
+            return
+        elif (canvas := Utility.ReadCache(self, "render", canvasKey)) is None:
+            return
 
-        if localHash == apiHash:
-            log.info("The Store has not updated, the local hash matches the API hash")
+        layout: Dict[str, Any] = json.loads(layout)
+        image: Image.Image = Image.open(BytesIO(canvas))
 
-            return False
-        else:
-            return True
+        return (image.convert(layout.get("mode", "RGBA")), layout)
 
-    def ProcessStore(self: Any, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        """Process and return the Store API response."""
+    def EncodeImage(self: Any, image: Union[Image.Image, bytes]) -> None:
+        """
+        Encode each variant of the Store image needed by the enabled
+        platforms exactly once, keeping the encoded bytes in memory for
+        every platform to share. A Store image which has already been
+        encoded as a PNG is used as-is, and its compressed variant is
+        encoded from the preview which was streamed alongside it.
+        """
 
-        featured: List[Dict[str, Any]] = []
-        operators: List[Dict[str, Any]] = []
-        blueprints: List[Dict[str, Any]] = []
+        start: float = perf_counter()
+        artifacts: Dict[str, bytes] = {}
 
-        for bundle in data.get("items"):
-            typeKey: str = bundle.get("typeKey")
+        if isinstance(image, bytes) is True:
+            artifacts["store.png"] = image
+        else:
+            artifacts["store.png"] = Utility.EncodeImage(self, image, optimize=True)
 
-            if typeKey == "FEATURED":
-                featured.append(bundle)
-            elif typeKey == "OPERATOR":
-                operators.append(bundle)
-            elif typeKey == "WEAPON":
-                blueprints.append(bundle)
-            else:
-                log.warning(f"Unknown Bundle typeKey found: {typeKey}")
+        if self.config["thirdParties"]["twitter"].get("enabled") is True:
+            if len(artifacts["store.png"]) >= 5242880:
+                if isinstance(image, bytes) is True:
+                    image = getattr(self, "preview", None) or Utility.DecodeImage(
+                        self, image, "RGB"
+                    )
 
-        lenF: int = len(featured)
-        lenO: int = len(operators)
-        lenB: int = len(blueprints)
+                data, extension = Utility.CompressImage(self, image, 5000000)
+                artifacts[f"store_compressed.{extension}"] = data
 
-        if (lenF == 0) or (lenO == 0) or (lenB == 0):
-            if self.config["preferences"].get("verify") is True:
-                log.error(
-                    f"Failed to process the Store (Featured: {lenF:,}, Operators: {lenO:,}, Blueprints: {lenB:,})"
+                log.info(
+                    f"Compressed the Store image to {len(data):,} bytes ({extension.upper()})"
                 )
 
-                return None
-
-        return {
-            "updateDate": Utility.ISOtoHumanDate(self, data.get("lastUpdated")),
-            "updateTime": Utility.ISOtoHumanTime(self, data.get("lastUpdated")),
-            "hash": data.get("hash"),
-            "featured": featured,
-            "operators": operators,
-            "blueprints": blueprints,
-        }
-
-    def BuildImage(self: Any, data: Dict[str, Any]) -> bool:
-        """Generate a stylized image for the provided Store data."""
+        # PRAW only accepts images from disk, so Reddit requires store.png
+        if (self.config["preferences"].get("saveImage", True) is True) or (
+            self.config["thirdParties"]["reddit"].get("enabled") is True
+        ):
+            for filename, data in artifacts.items():
+                Path(Emporium.OutputPath(self, filename)).write_bytes(data)
+
+        self.artifacts: Dict[str, bytes] = artifacts
+        self.preview = None
+
+        if getattr(self, "canvas", None) is not None:
+            Utility.WriteCache(
+                self,
+                "render",
+                Emporium.OutputPath(self, "canvas.png"),
+                artifacts["store.png"],
+            )
+            Utility.WriteCache(
+                self,
+                "render",
+                Emporium.OutputPath(self, "layout.json"),
+                json.dumps(self.layout).encode(),
+            )
 
-        background: Tuple[int, int, int] = tuple(
-            self.config["appearance"].get("background")
+        log.info(
+            f"Encoded {len(artifacts):,} Store image variants in {perf_counter() - start:.2f}s"
         )
-        text: Tuple[int, int, int] = tuple(self.config["appearance"].get("text"))
+
+    def CardKey(self: Any, bundle: Bundle) -> str:
+        """
+        Return a hash of every input which affects the appearance of the
+        card for the specified Bundle.
+        """
 
         fontName: str = self.config["appearance"].get("font")
-        font72 = Utility.GetTTF(self, 72, fontName)
-        font32 = Utility.GetTTF(self, 32, fontName)
+        assets: List[Path] = sorted(Path("assets/images/").glob("*.png"))
+        assets.append(Path(f"assets/fonts/{fontName}.ttf"))
+
+        inputs: List[Any] = [
+            bundle.id,
+            bundle.billboard,
+            bundle.logo,
+            bundle.price,
+            fontName,
+            [
+                (asset.name, asset.stat().st_mtime)
+                for asset in assets
+                if asset.is_file()
+            ],
+        ]
 
-        featured: List[Dict[str, Any]] = data.get("featured")
-        operators: List[Dict[str, Any]] = data.get("operators")
-        blueprints: List[Dict[str, Any]] = data.get("blueprints")
+        return hashlib.sha1(json.dumps(inputs).encode()).hexdigest()
 
-        dimensions: Tuple[int, int] = Emporium.CalculateDimensions(
-            self, featured, operators, blueprints
-        )
+    def RenderCards(
+        self: Any, bundles: List[Bundle], executor: Optional[Executor] = None
+    ) -> Dict[str, Image.Image]:
+        """
+        Return the cards for the provided Bundles keyed by card hash, only
+        generating those which are not already cached. Cards are generated
+        in parallel when multiple render workers are configured, using the
+        provided executor if any.
+        """
 
-        store: Image = Image.new("RGBA", (dimensions[0], dimensions[1]))
-        canvas: Any = ImageDraw.Draw(store)
+        from PIL import Image
 
-        store.paste(background, (0, 0, store.width, store.height))
+        shared: Optional[Dict[str, Image.Image]] = getattr(self, "sharedCards", None)
+        cards: Dict[str, Image.Image] = {}
+        jobs: Dict[str, Bundle] = {}
 
-        gameLogo: Image.Image = Utility.OpenImage(self, "game_logo.png")
-        gameLogo = Utility.ResizeImage(self, gameLogo, width=1000)
-        store.paste(
-            gameLogo, Utility.CenterX(self, gameLogo.width, store.width, 50), gameLogo
-        )
+        for bundle in bundles:
+            key: str = Emporium.CardKey(self, bundle)
 
-        prettyDate: str = data.get("updateDate")
-        textWidth, _ = font72.getsize(prettyDate)
-        canvas.text(
-            Utility.CenterX(self, textWidth, store.width, 275), prettyDate, text, font72
-        )
+            if (key in cards) or (key in jobs):
+                continue
 
-        sectionX: int = 0
-        sectionY: int = 500
-        cardY: int = 0
-        cardX: int = 0
+            if (shared is not None) and (key in shared):
+                cards[key] = shared[key]
+            elif (data := Utility.ReadCache(self, "cards", key)) is not None:
+                cards[key] = Utility.DecodeImage(self, data)
+            else:
+                jobs[key] = bundle
+
+        start: float = perf_counter()
+
+        if len(jobs) > 0:
+            Emporium.PrefetchImages(self, list(jobs.values()))
+
+        results: Iterable[Tuple[Tuple[int, int], bytes, float]]
+
+        if (executor is not None) and (len(jobs) > 1):
+            results = list(
+                executor.map(Emporium.CardRenderer(self, executor), jobs.values())
+            )
+        elif (len(jobs) > 1) and ((pool := Emporium.RenderExecutor(self)) is not None):
+            with pool:
+                results = list(
+                    pool.map(Emporium.CardRenderer(self, pool), jobs.values())
+                )
+        else:
+            results = map(partial(Emporium.RenderCard, self), jobs.values())
 
-        if len(featured) > 0:
-            canvas.text((50, sectionY), "Featured", text, font72)
+        for (key, bundle), (size, pixels, elapsed) in zip(jobs.items(), results):
+            card: Image.Image = Image.frombytes("RGBA", size, pixels)
+            cards[key] = card
 
-            i: int = 0
+            Utility.RecordMetric(self, bundle.name or key, elapsed, "cards")
 
-            for bundle in featured:
-                card: Image.Image = Emporium.BuildCard(self, bundle, font32)
+            if Utility.CacheEnabled(self) is True:
+                Utility.WriteCache(
+                    self,
+                    "cards",
+                    key,
+                    Utility.EncodeImage(self, card, compress_level=1),
+                )
 
-                cardX: int = sectionX + (50 + ((i % 2) * (card.width + 50)))
-                cardY: int = 500 + (75 + 50) + (i // 2) * (card.height + 50)
-                store.paste(card, (cardX, cardY), card)
+        if shared is not None:
+            shared.update(cards)
 
-                i += 1
+        elapsed: float = perf_counter() - start
 
-            sectionX += 50 + (1005 * 2) + 50
+        Utility.RecordStage(self, "RenderCards", elapsed)
 
-        if len(operators) > 0:
-            canvas.text((50 + sectionX, sectionY), "Operators & Identity", text, font72)
+        log.info(
+            f"Generated {len(jobs):,} cards and reused {len(cards) - len(jobs):,} cached cards in {elapsed:.2f}s"
+        )
 
-            i: int = 0
+        return cards
 
-            for bundle in operators:
-                card: Image.Image = Emporium.BuildCard(self, bundle, font32)
+    def RenderExecutor(self: Any) -> Optional[Executor]:
+        """
+        Return a new executor for generating cards in parallel, or None if
+        multiple render workers are not configured. Process workers receive
+        the Bundle images which have been prefetched so far.
+        """
 
-                cardX: int = sectionX + (50 + ((i % 2) * (card.width + 50)))
-                cardY: int = 500 + (75 + 50) + (i // 2) * (card.height + 50)
-                store.paste(card, (cardX, cardY), card)
+        performance: Dict[str, Any] = self.config.get("performance", {})
+        workers: int = performance.get("renderWorkers", 1)
 
-                i += 1
+        if workers <= 1:
+            return
 
-            sectionX += 50 + (1005 * 2) + 50
+        if performance.get("renderExecutor", "process") == "thread":
+            return ThreadPoolExecutor(workers)
 
-        if len(blueprints) > 0:
-            canvas.text((50 + sectionX, sectionY), "Blueprints", text, font72)
+        return ProcessPoolExecutor(
+            workers,
+            initializer=Emporium.InitializeWorker,
+            initargs=(Emporium, self.config, getattr(self, "images", {})),
+        )
 
-            i: int = 0
+    def CardRenderer(self: Any, executor: Executor) -> Callable[..., Any]:
+        """Return the card generation function for the provided executor."""
 
-            for bundle in blueprints:
-                card: Image.Image = Emporium.BuildCard(self, bundle, font32)
+        if isinstance(executor, ProcessPoolExecutor) is True:
+            return partial(Emporium.RenderCard, Emporium)
 
-                cardX: int = sectionX + (50 + ((i % 2) * (card.width + 50)))
-                cardY: int = 500 + (75 + 50) + (i // 2) * (card.height + 50)
-                store.paste(card, (cardX, cardY), card)
+        return partial(Emporium.RenderCard, self)
 
-                i += 1
+    def InitializeWorker(
+        self: Any, config: Dict[str, Any], images: Dict[str, bytes]
+    ) -> None:
+        """Prepare a render worker process to generate cards."""
 
-            sectionX += 50 + (1005 * 2) + 50
+        self.config: Dict[str, Any] = config
+        self.images: Dict[str, bytes] = images
 
-        store.save("store.png", optimize=True)
+        Utility.LoadAssets(self)
 
-        log.info("Generated the Store image")
+    def RenderCard(self: Any, bundle: Bundle) -> Tuple[Tuple[int, int], bytes, float]:
+        """
+        Generate the card for the specified Bundle and return its
+        dimensions, raw RGBA pixel buffer, and generation time.
+        """
 
-        return True
+        start: float = perf_counter()
 
-    def CalculateDimensions(
-        self: Any,
-        featured: List[Dict[str, Any]],
-        operators: List[Dict[str, Any]],
-        blueprints: List[Dict[str, Any]],
-    ) -> Tuple[int, int]:
-        """Determine the dimensions needed for the image based on the Store data."""
-
-        x: int = 0
-        y: int = 500
-
-        if len(featured) > 0:
-            x += 50 + (1005 * 2) + 50
-
-        if len(operators) > 0:
-            x += 50 + (1005 * 2) + 50
-
-        if len(blueprints) > 0:
-            x += 50 + (1005 * 2) + 50
-
-        x += 50
-        y += (
-            75
-            + (
-                (460 + 50)
-                * ceil(max(len(featured), len(operators), len(blueprints)) / 2)
-            )
-        ) + 50
+        font: Any = Utility.GetTTF(self, 32, self.config["appearance"].get("font"))
+        card: Image.Image = Emporium.BuildCard(self, bundle, font)
 
-        return (x, y)
+        return (card.size, card.tobytes(), perf_counter() - start)
 
-    def BuildCard(self: Any, bundle: Dict[str, Any], font: Any) -> Image.Image:
+    def BuildCard(self: Any, bundle: Bundle, font: Any) -> Image.Image:
         """Generate a stylized image for the specified Bundle."""
 
-        imageBaseUrl: str = "https://titles.trackercdn.com/modern-warfare/db/images/"
+        from PIL import ImageDraw
 
-        card: Image.Image = Utility.OpenImage(self, "card_container.png")
+        card: Image.Image = Utility.GetAsset(self, "card_container.png", copy=True)
 
-        billboardUrl: str = imageBaseUrl + bundle.get("billboard") + ".png"
-        billboard: Image.Image = Utility.DownloadImage(self, billboardUrl)
+        billboard: Image.Image = Emporium.GetBundleImage(self, bundle, "billboard")
         billboard = Utility.ResizeImage(self, billboard, height=card.height)
         billboard = billboard.crop((258, 0, 1263, card.height))
 
-        gradient: Image.Image = Utility.OpenImage(self, "card_gradient.png")
+        gradient: Image.Image = Utility.GetAsset(self, "card_gradient.png")
         billboard.alpha_composite(gradient)
 
         card.paste(billboard, Utility.CenterX(self, billboard.width, card.width), card)
 
-        logoUrl: str = imageBaseUrl + bundle.get("logo") + ".png"
-        logo: Image.Image = Utility.DownloadImage(self, logoUrl)
+        logo: Image.Image = Emporium.GetBundleImage(self, bundle, "logo")
         logo = Utility.ResizeImage(self, logo, width=360)
         card.alpha_composite(logo, (25, 25))
 
-        border: Image.Image = Utility.OpenImage(self, "card_border.png")
+        border: Image.Image = Utility.GetAsset(self, "card_border.png")
         card.alpha_composite(border)
 
-        tag: Image.Image = Utility.OpenImage(self, "price_container.png")
+        tag: Image.Image = Utility.GetAsset(self, "price_container.png", copy=True)
         canvas: Any = ImageDraw.Draw(tag)
-        price: Union[int, str] = bundle.get("price")
-        canvas.text((50, 5), f"{price:,}", (255, 255, 255), font)
+        canvas.text((50, 5), bundle.priceText, (255, 255, 255), font)
         card.alpha_composite(tag, (25, (card.height - tag.height - 25)))
 
         return card
 
-    def ShareTwitter(self: Any, store: Dict[str, Any]) -> None:
+    def Publish(self: Any, store: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """
+        Share the latest Store to every enabled platform concurrently and
+        return the result of each individual target.
+        """
+
+        platforms: Dict[str, Callable[[], Dict[str, Dict[str, Any]]]] = {}
+
+        if self.config["thirdParties"]["twitter"].get("enabled") is True:
+            platforms["Twitter"] = partial(Emporium.ShareTwitter, self, store)
+
+        if self.config["thirdParties"]["discord"].get("enabled") is True:
+            platforms["Discord"] = partial(Emporium.ShareDiscord, self, store)
+
+        if self.config["thirdParties"]["reddit"].get("enabled") is True:
+            platforms["Reddit"] = partial(Emporium.ShareReddit, self, store)
+
+        start: float = perf_counter()
+        results: Dict[str, Dict[str, Any]] = {}
+
+        for platform, result in Utility.RunConcurrently(self, platforms).items():
+            if result.get("success") is True:
+                results.update(result.get("result"))
+            else:
+                results[platform] = result
+
+        for target, result in results.items():
+            latency: float = result.get("latency")
+
+            if result.get("success") is True:
+                log.info(f"Published to {target} in {latency:.2f}s")
+            else:
+                log.error(
+                    f"Failed to publish to {target} in {latency:.2f}s, {result.get('error')}"
+                )
+
+        Utility.RecordMetric(
+            self,
+            "targets",
+            {
+                target: {"success": r.get("success"), "latency": r.get("latency")}
+                for target, r in results.items()
+            },
+        )
+
+        succeeded: int = len([r for r in results.values() if r.get("success")])
+
+        log.info(
+            f"Published the Store to {succeeded:,}/{len(results):,} targets in {perf_counter() - start:.2f}s"
+        )
+
+        return results
+
+    def PublishTargets(
+        self: Any, targets: Dict[str, Callable[[], Any]], workers: Optional[int] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Concurrently run the provided publishing targets, each bounded by
+        the configured publishing timeout, and return their results. The
+        number of workers defaults to that configured for publishing.
+        """
+
+        publishing: Dict[str, Any] = self.config.get("publishing", {})
+
+        return Utility.RunConcurrently(
+            self,
+            targets,
+            publishing.get("timeout", 120.0),
+            workers or publishing.get("workers", 16),
+        )
+
+    def ShareTwitter(self: Any, store: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
         """Share the latest Store to the configured Twitter account."""
 
+        import twitter
+
         updateDate: str = store.get("updateDate")
         updateTime: str = store.get("updateTime")
         creatorCode: str = self.config["preferences"].get("creatorCode")
@@ -340,26 +1570,66 @@ class Emporium:
 
         body += "Bundle Details: https://cod.tracker.gg/warzone/store"
 
-        if Utility.GetFileSize(self, "store.png") >= 5242880:
-            Utility.CompressImage(
-                self, "store.png", "store_compressed.png", 5000000, 0.75
-            )
+        filename: str = "store.png"
 
-            filename: str = "store_compressed"
-        else:
-            filename: str = "store"
+        for artifact in self.artifacts.keys():
+            if artifact.startswith("store_compressed") is True:
+                filename = artifact
 
-        try:
-            with open(f"{filename}.png", "rb") as file:
-                tweeter.PostUpdate(body, media=file)
-        except Exception as e:
-            log.error(f"Failed to post to Twitter, {e}")
+        return Emporium.PublishTargets(
+            self,
+            {"Twitter": partial(Emporium.PostTwitter, self, tweeter, body, filename)},
+        )
 
-            return
+    def PostTwitter(self: Any, tweeter: twitter.Api, body: str, filename: str) -> None:
+        """Post the provided status and image to Twitter."""
+
+        data: bytes = self.artifacts[filename]
+
+        # The media file is consumed by each attempt, so it is recreated
+        Utility.Retry(
+            self,
+            lambda: tweeter.PostUpdate(
+                body, media=Utility.BytesFile(self, data, filename)
+            ),
+            partial(Emporium.TwitterTransient, self),
+        )
+
+        Utility.CountBytes(self, "bytesUploaded", len(data))
+
+    def TwitterTransient(self: Any, error: Exception) -> bool:
+        """
+        Return a boolean value indicating whether or not the provided
+        Twitter error is temporary (a failure to connect, rate limit, or
+        server error), so that the request may be retried. Requests which
+        fail once sent may have been posted, so they are never retried.
+        """
+
+        import twitter
+
+        if Utility.Unsent(self, error) is True:
+            return True
+        elif isinstance(error, twitter.TwitterError) is False:
+            return False
+
+        details: Any = error.message
+
+        if isinstance(details, list) is False:
+            details = [details]
 
-        log.info("Shared the Store to Twitter")
+        for detail in details:
+            if isinstance(detail, dict) is False:
+                continue
+
+            # Rate limit exceeded, over capacity, or internal error
+            if detail.get("code") in [88, 130, 131]:
+                return True
+            elif detail.get("message") in ["Capacity Error", "Technical Error"]:
+                return True
 
-    def ShareDiscord(self: Any, store: Dict[str, Any]) -> None:
+        return False
+
+    def ShareDiscord(self: Any, store: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
         """Share the latest Store to the configured Discord webhooks."""
 
         updateDate: str = store.get("updateDate")
@@ -377,8 +1647,14 @@ class Emporium:
 
         body += "Bundle Details: [https://cod.tracker.gg/warzone/store](https://cod.tracker.gg/warzone/store)"
 
-        imageURL: str = Utility.UploadImage(self, "store.png", hepToken)
-        headers: Dict[str, Any] = {"content-type": "application/json"}
+        imageURL: Optional[str] = Utility.UploadImage(
+            self, self.artifacts["store.png"], hepToken, "store.png"
+        )
+
+        # Without the image there is nothing to deliver or queue
+        if imageURL is None:
+            raise Exception("Failed to upload the Store image to Hep.GG")
+
         embed: Dict[str, Any] = {
             "username": username,
             "avatar_url": avatar,
@@ -401,30 +1677,272 @@ class Emporium:
             ],
         }
 
-        count: int = 0
+        outcomes: Dict[str, int] = {}
+        results: Dict[str, Dict[str, Any]] = Emporium.DeliverDiscord(
+            self, webhooks, json.dumps(embed).encode(), outcomes
+        )
+
+        # Deliveries without an outcome failed temporarily or timed out
+        Emporium.QueueDeliveries(
+            self,
+            store.get("hash"),
+            embed,
+            [webhook for webhook in webhooks if webhook not in outcomes],
+        )
+
+        return results
+
+    def DeliverDiscord(
+        self: Any, webhooks: List[str], payload: bytes, outcomes: Dict[str, int]
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Concurrently deliver the serialized payload to every provided
+        Discord webhook, recording the final HTTP status of each delivery in
+        the outcomes. Webhooks which no longer exist are skipped, and those
+        which are found to no longer exist are pruned.
+        """
+
+        dead: Set[str] = Emporium.LoadDeadWebhooks(self)
+        headers: Dict[str, Any] = {"content-type": "application/json"}
+        targets: Dict[str, Callable[[], Any]] = {}
+        names: Dict[str, str] = {}
+        skipped: int = 0
+
+        for webhook in dict.fromkeys(webhooks):
+            if webhook in dead:
+                outcomes[webhook] = 404
+                skipped += 1
+
+                continue
+
+            webhookId: str = webhook.rstrip("/").rsplit("/", 2)[-2]
+            name: str = f"Discord webhook {webhookId}"
+
+            if name in targets:
+                name = f"{name} ({len(targets):,})"
+
+            names[name] = webhook
+            targets[name] = partial(
+                Emporium.PostDiscord, self, webhook, headers, payload, outcomes
+            )
+
+        if skipped > 0:
+            log.info(f"Skipped {skipped:,} pruned Discord webhooks")
+
+        results: Dict[str, Dict[str, Any]] = Emporium.PublishTargets(
+            self, targets, self.config["thirdParties"]["discord"].get("workers")
+        )
+
+        # Deliveries still in flight may yet succeed, so they are not retried
+        for name, result in results.items():
+            if result.get("timedOut") is True:
+                outcomes.setdefault(names[name], 0)
+
+        pruned: List[str] = [
+            webhook
+            for webhook, status in list(outcomes.items())
+            if (status == 404) and (webhook not in dead)
+        ]
+
+        if len(pruned) > 0:
+            Utility.WriteFile(
+                self,
+                Emporium.OutputPath(self, "webhooks_pruned.json"),
+                sorted(dead.union(pruned)),
+            )
+
+            log.warning(
+                f"Pruned {len(pruned):,} Discord webhooks which no longer exist (HTTP 404)"
+            )
+
+        return results
+
+    def LoadDeadWebhooks(self: Any) -> Set[str]:
+        """Return the Discord webhooks which were pruned for no longer existing."""
+
+        path: str = Emporium.OutputPath(self, "webhooks_pruned.json")
+
+        if Utility.FileExists(self, path) is False:
+            return set()
+
+        return set(Utility.ReadFile(self, path) or [])
+
+    def PostDiscord(
+        self: Any,
+        webhook: str,
+        headers: Dict[str, Any],
+        payload: bytes,
+        outcomes: Dict[str, int],
+    ) -> None:
+        """
+        Post the serialized payload to the specified Discord webhook,
+        recording the HTTP status in the outcomes if it was delivered or
+        rejected. Rate limits and requests which were never sent are not
+        recorded so that they may be retried, while server errors may have
+        been delivered, so they are recorded, as are deliveries which time
+        out or fail in flight with a status of 0.
+        """
+
+        import httpx
+
+        try:
+            res: Any = Utility.Request(
+                self, "POST", webhook, headers=headers, data=payload
+            )
+        except httpx.TransportError as e:
+            # The request may have been delivered, so it is not retried
+            if Utility.Unsent(self, e) is False:
+                outcomes[webhook] = 0
+
+            raise
+
+        status: int = res.status_code
+
+        # HTTP 200 OK or HTTP 204 No Content
+        if (status == 200) or (status == 204):
+            outcomes[webhook] = status
+
+            return
+        elif status != 429:
+            outcomes[webhook] = status
+
+        raise Exception(f"Discord rejected the webhook request (HTTP {status})")
+
+    def LoadQueue(self: Any) -> List[Dict[str, Any]]:
+        """Return the queued deliveries which previously failed."""
+
+        path: str = Emporium.OutputPath(self, "queue.json")
+
+        if Utility.FileExists(self, path) is False:
+            return []
+
+        return Utility.ReadFile(self, path) or []
+
+    def QueueDeliveries(
+        self: Any, apiHash: str, embed: Dict[str, Any], webhooks: List[str]
+    ) -> None:
+        """
+        Persist the failed deliveries of the provided embed so that they may
+        be retried on the next run. Deliveries of previous Stores are
+        discarded.
+        """
+
+        queue: List[Dict[str, Any]] = [
+            entry
+            for entry in Emporium.LoadQueue(self)
+            if (entry.get("hash") == apiHash) and (entry.get("url") not in webhooks)
+        ]
 
         for webhook in webhooks:
-            Utility.POST(self, webhook, headers=headers, data=embed)
+            queue.append(
+                {
+                    "url": webhook,
+                    "embed": embed,
+                    "hash": apiHash,
+                    "created": datetime.utcnow().timestamp(),
+                    "attempts": 1,
+                }
+            )
 
-            count += 1
+        path: str = Emporium.OutputPath(self, "queue.json")
 
-        log.info(f"Shared the Store to {count:,} Discord webhooks")
+        if (len(queue) > 0) or (Utility.FileExists(self, path) is True):
+            Utility.WriteFile(self, path, queue)
 
-    def ShareReddit(self: Any, store: Dict[str, Any]) -> None:
-        """Share the latest Store to the configured Reddit communities."""
+        if len(webhooks) > 0:
+            log.warning(f"Queued {len(webhooks):,} failed Discord deliveries for retry")
+
+    def DrainQueue(self: Any) -> None:
+        """
+        Retry the queued deliveries of the latest Store, discarding those
+        which are stale or have exceeded the maximum number of attempts.
+        """
+
+        if len(queue := Emporium.LoadQueue(self)) == 0:
+            return
+
+        publishing: Dict[str, Any] = self.config.get("publishing", {})
+        localHash: Optional[str] = Emporium.LocalHash(self)
+        now: float = datetime.utcnow().timestamp()
+
+        queue = [
+            entry
+            for entry in queue
+            if (entry.get("hash") == localHash)
+            and (now - entry.get("created", 0) <= publishing.get("queueTTL", 86400))
+            and (entry.get("attempts", 0) < publishing.get("maxAttempts", 10))
+        ]
+
+        payloads: Dict[bytes, List[str]] = {}
+        outcomes: Dict[str, int] = {}
+
+        # Queued deliveries of the same Store usually share their embed
+        for entry in queue:
+            payload: bytes = json.dumps(entry["embed"]).encode()
+            payloads.setdefault(payload, []).append(entry["url"])
+
+        for payload, webhooks in payloads.items():
+            Emporium.DeliverDiscord(self, webhooks, payload, outcomes)
+
+        remaining: List[Dict[str, Any]] = [
+            {**entry, "attempts": entry.get("attempts", 0) + 1}
+            for entry in queue
+            if entry["url"] not in outcomes
+        ]
+        delivered: int = len([s for s in outcomes.values() if s in [200, 204]])
+
+        Utility.WriteFile(self, Emporium.OutputPath(self, "queue.json"), remaining)
+
+        log.info(
+            f"Delivered {delivered:,}/{len(queue):,} queued Discord deliveries, {len(remaining):,} remain queued"
+        )
+
+    def ShareReddit(self: Any, store: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """
+        Share the latest Store to the configured Reddit communities
+        concurrently, then perform the Moderator actions on each submission.
+        """
+
+        updateDate: str = store.get("updateDate")
+        updateTime: str = store.get("updateTime")
+        subreddits: List[str] = self.config["thirdParties"]["reddit"].get("communities")
+
+        # The title and comment are identical for every community
+        title: str = (
+            f"Modern Warfare and Warzone Store for {updateDate} at {updateTime} UTC"
+        )
+        body: str = Emporium.BuildRedditComment(self, store)
+        targets: Dict[str, Callable[[], Any]] = {}
+
+        for subreddit in subreddits:
+            targets[f"/r/{subreddit.get('name')}"] = partial(
+                Emporium.SubmitReddit, self, subreddit, title, body
+            )
+
+        return Emporium.PublishTargets(self, targets)
+
+    def RedditSession(self: Any) -> praw.Reddit:
+        """
+        Return an idle authenticated Reddit session for the configured
+        account, creating one if necessary. PRAW is not thread-safe, so
+        each session is only used by one thread until it is released.
+        """
+
+        import praw
 
-        creatorCode: str = self.config["preferences"].get("creatorCode")
         username: str = self.config["thirdParties"]["reddit"].get("username")
         password: str = self.config["thirdParties"]["reddit"].get("password")
         clientId: str = self.config["thirdParties"]["reddit"].get("clientId")
         secret: str = self.config["thirdParties"]["reddit"].get("clientSecret")
-        subreddits: List[str] = self.config["thirdParties"]["reddit"].get("communities")
 
-        updateDate: str = store.get("updateDate")
-        updateTime: str = store.get("updateTime")
-        featured: List[Dict[str, Any]] = store.get("featured")
-        operators: List[Dict[str, Any]] = store.get("operators")
-        blueprints: List[Dict[str, Any]] = store.get("blueprints")
+        with sessionLock:
+            sessions: Dict[Tuple[str, str], List[praw.Reddit]] = getattr(
+                self, "redditSessions", {}
+            )
+            self.redditSessions: Dict[Tuple[str, str], List[praw.Reddit]] = sessions
+
+            if len(idle := sessions.setdefault((clientId, username), [])) > 0:
+                return idle.pop()
 
         reddit: praw.Reddit = praw.Reddit(
             username=username,
@@ -436,96 +1954,155 @@ class Emporium:
         reddit.validate_on_submit = True
 
         if reddit.read_only is not False:
-            log.error("Failed to authenticate with Reddit")
+            raise Exception("Failed to authenticate with Reddit")
 
-            return
+        return reddit
 
-        count: int = 0
+    def ReleaseReddit(self: Any, reddit: praw.Reddit) -> None:
+        """Return the provided Reddit session so that it may be reused."""
 
-        for subreddit in subreddits:
-            community: praw.reddit.Subreddit = reddit.subreddit(subreddit.get("name"))
-
-            post: praw.reddit.Submission = community.submit_image(
-                f"Modern Warfare and Warzone Store for {updateDate} at {updateTime} UTC",
-                "store.png",
-                subreddit.get("flairId"),
-                subreddit.get("flairText"),
-                send_replies=False,
-                timeout=30,
-                collection_id=subreddit.get("collectionId"),
-            )
+        username: str = self.config["thirdParties"]["reddit"].get("username")
+        clientId: str = self.config["thirdParties"]["reddit"].get("clientId")
 
-            if post is None:
-                name: str = subreddit.get("name")
-                log.error(f"Failed to submit to /r/{name}")
+        with sessionLock:
+            self.redditSessions[(clientId, username)].append(reddit)
+
+    def BuildRedditComment(self: Any, store: Dict[str, Any]) -> str:
+        """Return the Bundle listing which is commented on each Reddit submission."""
 
+        creatorCode: str = self.config["preferences"].get("creatorCode")
+        sections: Dict[str, List[Bundle]] = store.get("sections")
+
+        body: str = ""
+
+        if creatorCode is not None:
+            body += f"Consider supporting us! Use the Creator Code `{creatorCode}` in the Store to do so.\n\n"
+
+        for name, bundles in sections.items():
+            if len(bundles) == 0:
                 continue
 
-            body: str = ""
+            body += f"## {name}\n"
+
+            for bundle in bundles:
+                body += (
+                    f"\n* [{bundle.name}]({bundle.url}) ({bundle.priceText} CODPoints)"
+                )
+
+            body += "\n\n"
 
-            if creatorCode is not None:
-                body += f"Consider supporting us! Use the Creator Code `{creatorCode}` in the Store to do so.\n\n"
+        return body
 
-            if len(featured) > 0:
-                body += "## Featured\n"
+    def SubmitReddit(
+        self: Any, subreddit: Dict[str, Any], title: str, body: str
+    ) -> None:
+        """
+        Submit the latest Store to the specified Reddit community and
+        perform the Moderator actions on the submission, using a Reddit
+        session which no other thread is using.
+        """
 
-                for bundle in featured:
-                    name: str = bundle.get("name")
-                    url: str = "https://cod.tracker.gg/warzone/db/bundles/" + str(
-                        bundle.get("id")
-                    ) + "-" + bundle.get("slug")
-                    price: int = bundle.get("price")
+        name: str = subreddit.get("name")
+        reddit: praw.Reddit = Emporium.RedditSession(self)
 
-                    body += f"\n* [{name}]({url}) ({price:,} CODPoints)"
+        try:
+            community: praw.reddit.Subreddit = reddit.subreddit(name)
+
+            post: praw.reddit.Submission = Utility.Retry(
+                self,
+                partial(
+                    community.submit_image,
+                    title,
+                    Emporium.OutputPath(self, "store.png"),
+                    subreddit.get("flairId"),
+                    subreddit.get("flairText"),
+                    send_replies=False,
+                    timeout=30,
+                    collection_id=subreddit.get("collectionId"),
+                ),
+                partial(Emporium.RedditTransient, self),
+            )
 
-                body += "\n\n"
+            if post is None:
+                raise Exception(f"Failed to submit to /r/{name}")
 
-            if len(operators) > 0:
-                body += "## Operators & Identity\n"
+            Utility.CountBytes(self, "bytesUploaded", len(self.artifacts["store.png"]))
 
-                for bundle in operators:
-                    name: str = bundle.get("name")
-                    url: str = "https://cod.tracker.gg/warzone/db/bundles/" + str(
-                        bundle.get("id")
-                    ) + "-" + bundle.get("slug")
-                    price: int = bundle.get("price")
+            comment: praw.reddit.Comment = post.reply(body)
 
-                    body += f"\n* [{name}]({url}) ({price:,} CODPoints)"
+            Emporium.ModerateReddit(self, f"/r/{name}", post, comment)
+        finally:
+            Emporium.ReleaseReddit(self, reddit)
 
-                body += "\n\n"
+    def RedditTransient(self: Any, error: Exception) -> bool:
+        """
+        Return a boolean value indicating whether or not the provided
+        Reddit error is temporary (a failure to connect or a rate limit), so
+        that the submission may be retried. Requests which fail once sent,
+        and server errors which prawcore has already retried, may have been
+        submitted, as has the image once a WebSocketException is raised, so
+        they are never retried.
+        """
 
-            if len(blueprints) > 0:
-                body += "## Blueprints\n"
+        from prawcore.exceptions import RequestException, ResponseException
 
-                for bundle in blueprints:
-                    name: str = bundle.get("name")
-                    url: str = "https://cod.tracker.gg/warzone/db/bundles/" + str(
-                        bundle.get("id")
-                    ) + "-" + bundle.get("slug")
-                    price: int = bundle.get("price")
+        if isinstance(error, RequestException) is True:
+            return Utility.Unsent(self, error)
+        elif isinstance(error, ResponseException) is True:
+            return error.response.status_code == 429
 
-                    body += f"\n* [{name}]({url}) ({price:,} CODPoints)"
+        return False
 
-                body += "\n\n"
+    def ModerateReddit(
+        self: Any,
+        target: str,
+        post: praw.reddit.Submission,
+        comment: praw.reddit.Comment,
+    ) -> None:
+        """
+        Approve the provided Reddit submission, then approve, distinguish,
+        sticky, and lock its comment.
+        """
 
-            comment: praw.reddit.Comment = post.reply(body)
+        tasks: Dict[str, Callable[[], Any]] = {
+            "submission": post.mod.approve,
+            "comment": partial(Emporium.ModerateComment, self, comment),
+        }
 
+        for task, action in tasks.items():
             try:
-                post.mod.approve()
-
-                comment.mod.approve()
-                comment.mod.distinguish(how="yes", sticky=True)
-                comment.mod.lock()
+                action()
             except Exception as e:
-                log.warning(f"Failed to perform Moderator actions on Reddit, {e}")
+                log.warning(
+                    f"Failed to perform Moderator actions on the {target} {task}, {e}"
+                )
 
-            count += 1
+    def ModerateComment(self: Any, comment: praw.reddit.Comment) -> None:
+        """Approve, distinguish, sticky, and lock the provided Reddit comment."""
 
-        log.info(f"Shared the Store to {count:,} Reddit communities")
+        comment.mod.approve()
+        comment.mod.distinguish(how="yes", sticky=True)
+        comment.mod.lock()
 
 
 if __name__ == "__main__":
+    parser: ArgumentParser = ArgumentParser(
+        description="Call of Duty: Modern Warfare and Warzone Store generator."
+    )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="keep running and poll the Store on the configured interval",
+    )
+    parser.add_argument(
+        "--profile",
+        action="append",
+        dest="profiles",
+        help="only run the specified profile (repeatable)",
+    )
+    args: Namespace = parser.parse_args()
+
     try:
-        Emporium.Initialize(Emporium)
+        Emporium.Initialize(Emporium, daemon=args.daemon, profiles=args.profiles)
     except KeyboardInterrupt:
         exit()
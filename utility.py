@@ -1,13 +1,48 @@
+from __future__ import annotations
+
 import json
 import logging
-from datetime import datetime
+import math
+import struct
+import sys
+import zlib
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor
+from concurrent.futures import wait as futureWait
+from datetime import datetime, timezone
+from io import BytesIO
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple, Union
+from random import uniform
+from threading import Lock, RLock
+from time import perf_counter, sleep
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 
 import httpx
-from PIL import Image, ImageFont
+
+# Pillow is imported by the functions which need it
+if TYPE_CHECKING:
+    from PIL import Image, ImageFont
+
+try:
+    import resource
+except ImportError:
+    # The resource module is only available on Unix platforms
+    resource = None
 
 log: logging.Logger = logging.getLogger(__name__)
+clientLock: Lock = Lock()
+cacheLock: RLock = RLock()
+metricsLock: Lock = Lock()
+rateLimitLock: Lock = Lock()
 
 
 class Utility:
@@ -20,7 +55,7 @@ class Utility:
 
         try:
             with open(path, "r") as file:
-                if path.rsplit(".")[1] == "json":
+                if Path(path).suffix == ".json":
                     return json.loads(file.read())
                 else:
                     return file.read()
@@ -34,7 +69,7 @@ class Utility:
 
         try:
             with open(path, "w+") as file:
-                if path.rsplit(".")[1] == "json":
+                if Path(path).suffix == ".json":
                     if kwargs.get("compress") is True:
                         file.write(json.dumps(contents, ensure_ascii=False))
                     else:
@@ -65,6 +100,8 @@ class Utility:
     ) -> Image.Image:
         """Return the image object for the specified file."""
 
+        from PIL import Image
+
         try:
             return Image.open(f"{directory}{filename}", "RGBA")
         except ValueError:
@@ -72,26 +109,153 @@ class Utility:
         except Exception as e:
             log.error(f"Failed to read image file, {e}")
 
+    def LoadAssets(self: Any, directory: str = "assets/images/") -> int:
+        """
+        Decode every image in the specified directory into the asset
+        registry and return the number of assets loaded.
+        """
+
+        assets: Dict[str, Image.Image] = getattr(self, "assets", {})
+
+        for path in sorted(Path(directory).glob("*.png")):
+            if path.name in assets:
+                continue
+
+            if (image := Utility.OpenImage(self, path.name, directory)) is not None:
+                image.load()
+
+                assets[path.name] = image
+
+        self.assets: Dict[str, Image.Image] = assets
+
+        return len(assets)
+
+    def GetAsset(
+        self: Any, filename: str, copy: bool = False, directory: str = "assets/images/"
+    ) -> Image.Image:
+        """
+        Return the image object for the specified asset from the asset
+        registry. Registered assets are shared templates, a copy must be
+        requested if the image is going to be modified.
+        """
+
+        assets: Dict[str, Image.Image] = getattr(self, "assets", {})
+
+        if (asset := assets.get(filename)) is None:
+            asset = Utility.OpenImage(self, filename, directory)
+            asset.load()
+
+            assets[filename] = asset
+            self.assets: Dict[str, Image.Image] = assets
+
+        if copy is True:
+            return asset.copy()
+
+        return asset
+
+    def ClientOptions(self: Any, host: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Return the configured HTTP client options, optionally applying the
+        overrides configured for the specified host.
+        """
+
+        network: Dict[str, Any] = {**getattr(self, "config", {}).get("network", {})}
+        network.update(network.get("hosts", {}).get(host, {}))
+
+        timeout: float = network.get("timeout", 30.0)
+
+        return {
+            "http2": network.get("http2", False),
+            "timeout": httpx.Timeout(
+                timeout, connect=network.get("connectTimeout", timeout)
+            ),
+            "limits": httpx.Limits(
+                max_connections=network.get("maxConnections", 16),
+                max_keepalive_connections=network.get("maxKeepAlive", 8),
+            ),
+        }
+
+    def GetClient(self: Any, url: str) -> httpx.Client:
+        """
+        Return the shared, connection pooling HTTP client for the host of
+        the specified URL, creating it if necessary.
+        """
+
+        host: str = httpx.URL(url).host
+
+        with clientLock:
+            clients: Dict[str, httpx.Client] = getattr(self, "clients", {})
+
+            if (client := clients.get(host)) is None:
+                client = httpx.Client(**Utility.ClientOptions(self, host))
+
+                clients[host] = client
+                self.clients: Dict[str, httpx.Client] = clients
+
+        return client
+
+    def CloseClients(self: Any) -> None:
+        """Close every shared HTTP client and their pooled connections."""
+
+        with clientLock:
+            for client in getattr(self, "clients", {}).values():
+                client.close()
+
+            self.clients: Dict[str, httpx.Client] = {}
+
     def GET(self: Any, url: str) -> Optional[Union[Dict[str, Any], str]]:
         """
         Perform an HTTP GET request to the specified URL and return its
         response if the request is successful.
         """
 
-        res: httpx.Response = httpx.get(url)
+        res: httpx.Response = Utility.Request(self, "GET", url)
 
         # HTTP 200 OK
         if res.status_code == 200:
-            contentType: Optional[str] = res.headers.get("content-type")
+            return Utility.ReadResponse(self, res)
+        else:
+            log.error(f"Failed to GET {url} (HTTP {res.status_code}):\n{res.text}")
+
+    def ConditionalGET(
+        self: Any, url: str, validators: Dict[str, str]
+    ) -> Tuple[int, Optional[Union[Dict[str, Any], str]], Dict[str, str]]:
+        """
+        Perform a conditional HTTP GET request to the specified URL using
+        the provided validators (etag, lastModified) and return the status
+        code, the response if the resource was modified, and the validators
+        of the response.
+        """
+
+        headers: Dict[str, str] = {}
 
-            if contentType == "application/json; charset=utf-8":
-                return res.json()
-            elif contentType == "application/json":
-                return res.json()
+        if (etag := validators.get("etag")) is not None:
+            headers["If-None-Match"] = etag
+
+        if (lastModified := validators.get("lastModified")) is not None:
+            headers["If-Modified-Since"] = lastModified
+
+        res: httpx.Response = Utility.Request(self, "GET", url, headers=headers)
+        status: int = res.status_code
+        latest: Dict[str, str] = {
+            key: value
+            for key, value in [
+                ("etag", res.headers.get("etag")),
+                ("lastModified", res.headers.get("last-modified")),
+            ]
+            if value is not None
+        }
 
-            return res.text
+        # HTTP 200 OK
+        if status == 200:
+            return (status, Utility.ReadResponse(self, res), latest)
+        # HTTP 304 Not Modified
+        elif status == 304:
+            return (status, None, {**validators, **latest})
         else:
-            log.error(f"Failed to GET {url} (HTTP {res.status_code}):\n{res.text}")
+            log.error(f"Failed to GET {url} (HTTP {status}):\n{res.text}")
+
+            return (status, None, {})
 
     def POST(
         self: Any,
@@ -106,49 +270,447 @@ class Utility:
         successful.
         """
 
-        res: httpx.Response = httpx.post(
-            url, headers=headers, json=data, files=files, timeout=30.0
+        res: httpx.Response = Utility.Request(
+            self, "POST", url, headers=headers, json=data, files=files
         )
         status: int = res.status_code
 
         # HTTP 200 OK or HTTP 204 No Content
         if (status == 200) or (status == 204):
-            contentType: Optional[str] = res.headers.get("content-type")
-
-            if contentType == "application/json; charset=utf-8":
-                return res.json()
-            elif contentType == "application/json":
-                return res.json()
-
-            return res.text
+            return Utility.ReadResponse(self, res)
         else:
             log.error(f"Failed to POST {url} (HTTP {status}):\n{res.text}")
 
+    def Request(self: Any, method: str, url: str, **kwargs) -> httpx.Response:
+        """
+        Perform an HTTP request to the specified URL and return its response.
+        Requests wait for the rate limits of the host and route, and those
+        which are rate limited (HTTP 429), fail with a server error (HTTP
+        5xx), or fail to connect are retried with exponential backoff.
+        Requests other than GET and HEAD may have been received once sent,
+        so their network failures are only retried if they were never sent,
+        and their server errors are never retried.
+        """
+
+        retries: int = getattr(self, "config", {}).get("network", {}).get("retries", 3)
+        idempotent: bool = method.upper() in ["GET", "HEAD"]
+        attempt: int = 0
+
+        while True:
+            Utility.AcquireRequest(self, url)
+
+            try:
+                res: httpx.Response = Utility.GetClient(self, url).request(
+                    method, url, **kwargs
+                )
+            except httpx.TransportError as e:
+                if attempt >= retries:
+                    raise
+                elif (idempotent is False) and (Utility.Unsent(self, e) is False):
+                    raise
+
+                delay: float = Utility.Backoff(self, attempt)
+
+                log.warning(f"Failed to {method} {url}, retrying in {delay:.1f}s, {e}")
+            else:
+                Utility.CountTransfer(self, res)
+
+                limited: bool = Utility.UpdateRateLimits(self, url, res)
+                status: int = res.status_code
+
+                if ((status != 429) and (status < 500)) or (attempt >= retries):
+                    return res
+                elif (status != 429) and (idempotent is False):
+                    return res
+
+                # Rate limited requests wait for the reset in AcquireRequest
+                if limited is True:
+                    delay = 0.0
+
+                    log.warning(f"Rate limited by {url} (HTTP {status}), retrying")
+                else:
+                    delay = Utility.Backoff(self, attempt)
+
+                    log.warning(
+                        f"Failed to {method} {url} (HTTP {status}), retrying in {delay:.1f}s"
+                    )
+
+            sleep(delay)
+
+            attempt += 1
+
+    def AcquireRequest(self: Any, url: str) -> None:
+        """
+        Wait until a request to the specified URL is permitted by the rate
+        limits of its route and by the token bucket of its host, which is
+        configured with the rate (requests per second) and burst of the
+        host in the network object.
+        """
+
+        host: str = httpx.URL(url).host
+        route: str = url.split("?", 1)[0]
+
+        network: Dict[str, Any] = {**getattr(self, "config", {}).get("network", {})}
+        network.update(network.get("hosts", {}).get(host, {}))
+
+        rate: Optional[float] = network.get("rate")
+        burst: float = network.get("burst", rate or 1)
+
+        while True:
+            with rateLimitLock:
+                limits: Dict[str, Any] = getattr(self, "rateLimits", {})
+                self.rateLimits: Dict[str, Any] = limits
+
+                now: float = perf_counter()
+                wait: float = max(limits.get(host, 0.0), limits.get(route, 0.0)) - now
+
+                if (wait <= 0) and (rate is None):
+                    return
+                elif wait <= 0:
+                    tokens, updated = limits.get(f"{host}/bucket", (burst, now))
+                    tokens = min(burst, tokens + ((now - updated) * rate))
+
+                    if tokens >= 1:
+                        limits[f"{host}/bucket"] = (tokens - 1, now)
+
+                        return
+
+                    limits[f"{host}/bucket"] = (tokens, now)
+                    wait = (1 - tokens) / rate
+
+            sleep(wait)
+
+    def UpdateRateLimits(self: Any, url: str, res: httpx.Response) -> bool:
+        """
+        Update the rate limits of the route (or the entire host) of the
+        specified URL using the Retry-After and X-RateLimit headers of the
+        provided response. Return True if the route is now rate limited.
+        """
+
+        host: str = httpx.URL(url).host
+        route: str = url.split("?", 1)[0]
+        headers: httpx.Headers = res.headers
+
+        retryAfter: Optional[str] = headers.get("retry-after")
+        remaining: Optional[str] = headers.get("x-ratelimit-remaining")
+        resetAfter: Optional[str] = headers.get("x-ratelimit-reset-after")
+
+        wait: Optional[float] = None
+
+        try:
+            if (res.status_code == 429) and (retryAfter is not None):
+                wait = float(retryAfter)
+            elif (res.status_code == 429) or (remaining == "0"):
+                wait = float(resetAfter) if resetAfter is not None else None
+        except ValueError:
+            # Retry-After may be an HTTP date, fall back to backoff instead
+            wait = None
+
+        if wait is None:
+            return False
+
+        scope: str = host if headers.get("x-ratelimit-global") == "true" else route
+
+        with rateLimitLock:
+            limits: Dict[str, Any] = getattr(self, "rateLimits", {})
+            limits[scope] = max(limits.get(scope, 0.0), perf_counter() + wait)
+            self.rateLimits: Dict[str, Any] = limits
+
+        return True
+
+    def Backoff(self: Any, attempt: int) -> float:
+        """
+        Return the number of seconds to wait before the specified retry
+        attempt, which grows exponentially with jitter.
+        """
+
+        network: Dict[str, Any] = getattr(self, "config", {}).get("network", {})
+        delay: float = network.get("backoff", 1.0) * (2**attempt)
+
+        return min(delay, network.get("maxBackoff", 60.0)) * uniform(0.5, 1.0)
+
+    def Retry(
+        self: Any,
+        task: Callable[[], Any],
+        transient: Optional[Callable[[Exception], bool]] = None,
+    ) -> Any:
+        """
+        Run the provided task and return its result, retrying it with
+        exponential backoff if it raises an exception. When provided, only
+        exceptions which the transient function accepts are retried.
+        """
+
+        retries: int = getattr(self, "config", {}).get("network", {}).get("retries", 3)
+
+        for attempt in range(retries + 1):
+            try:
+                return task()
+            except Exception as e:
+                if attempt >= retries:
+                    raise
+                elif (transient is not None) and (transient(e) is not True):
+                    raise
+
+                delay: float = Utility.Backoff(self, attempt)
+
+                log.warning(
+                    f"Failed to complete request, retrying in {delay:.1f}s, {e}"
+                )
+
+                sleep(delay)
+
+    def Unsent(self: Any, error: Exception) -> bool:
+        """
+        Return a boolean value indicating whether or not the provided
+        request error occurred before the request left the client (while
+        connecting or waiting for a pooled connection), so that requests
+        which create content may be retried without being sent twice.
+        """
+
+        # Reddit wraps the original requests error
+        error = getattr(error, "original_exception", error)
+
+        if isinstance(
+            error, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+        ):
+            return True
+
+        try:
+            from requests.exceptions import ConnectionError, ConnectTimeout
+            from urllib3.exceptions import ConnectTimeoutError, EmptyPoolError
+        except ImportError:
+            return False
+
+        if isinstance(error, ConnectTimeout) is True:
+            return True
+        elif isinstance(error, ConnectionError) is False:
+            return False
+
+        # Connection failures are wrapped in urllib3's MaxRetryError
+        reason: Any = getattr(error.args[0] if error.args else None, "reason", None)
+
+        return isinstance(reason, (ConnectTimeoutError, EmptyPoolError))
+
+    def ReadResponse(
+        self: Any, res: httpx.Response
+    ) -> Optional[Union[Dict[str, Any], str]]:
+        """Return the body of the provided HTTP response, decoding JSON content."""
+
+        contentType: Optional[str] = res.headers.get("content-type")
+
+        if contentType == "application/json; charset=utf-8":
+            return res.json()
+        elif contentType == "application/json":
+            return res.json()
+
+        return res.text
+
+    def CountTransfer(self: Any, res: httpx.Response) -> None:
+        """Count the bytes transferred by the provided HTTP response."""
+
+        Utility.CountBytes(self, "bytesDownloaded", len(res.content))
+        Utility.CountBytes(
+            self, "bytesUploaded", int(res.request.headers.get("content-length", 0))
+        )
+
     def DownloadImage(self: Any, url: str) -> Image.Image:
         """Download the specified image file and return the image object."""
 
-        with httpx.stream("GET", url, timeout=30.0) as res:
-            if res.status_code == 200:
-                try:
-                    return Image.open(res, "RGBA")
-                except ValueError:
-                    return Image.open(res).convert("RGBA")
+        res: httpx.Response = Utility.Request(self, "GET", url)
+
+        if res.status_code == 200:
+            return Utility.DecodeImage(self, res.content)
+        else:
+            log.error(f"Failed to download image (HTTP {res.status_code})")
+
+    def DownloadImages(
+        self: Any, urls: List[str], limit: int = 16
+    ) -> Tuple[Dict[str, bytes], int]:
+        """
+        Concurrently download the specified image files, with at most
+        limit requests in flight, and return their contents keyed by URL
+        alongside the number of bytes transferred. Cached images are
+        revalidated using conditional requests. Downloads share the pooled
+        client, rate limits, and retries of every other request.
+        """
+
+        images: Dict[str, bytes] = {}
+        transferred: List[int] = []
+
+        def Download(url: str) -> None:
+            key: str = url.rsplit("/", 1)[-1].rsplit(".", 1)[0]
+            headers: Dict[str, str] = {}
+
+            if (entry := Utility.CacheEntry(self, "images", key)) is not None:
+                if (etag := entry.get("etag")) is not None:
+                    headers["If-None-Match"] = etag
+
+                if (lastModified := entry.get("lastModified")) is not None:
+                    headers["If-Modified-Since"] = lastModified
+
+            try:
+                res: httpx.Response = Utility.Request(self, "GET", url, headers=headers)
+            except Exception as e:
+                log.error(f"Failed to download image {url}, {e}")
+
+                return
+
+            # HTTP 304 Not Modified
+            if (res.status_code == 304) and (
+                (cached := Utility.ReadCache(self, "images", key)) is not None
+            ):
+                images[url] = cached
+            elif res.status_code == 200:
+                images[url] = res.content
+                transferred.append(len(res.content))
+
+                Utility.WriteCache(
+                    self,
+                    "images",
+                    key,
+                    res.content,
+                    etag=res.headers.get("etag"),
+                    lastModified=res.headers.get("last-modified"),
+                )
             else:
                 log.error(f"Failed to download image (HTTP {res.status_code})")
 
-    def UploadImage(self: Any, path: str, token: str) -> Optional[str]:
-        """Upload the specified image to the Hep.GG service and return its URL."""
+        if len(urls) > 0:
+            with ThreadPoolExecutor(min(limit, len(urls))) as executor:
+                list(executor.map(Download, urls))
 
-        with open(path, "rb") as file:
-            res: Dict[str, Any] = Utility.POST(
-                self,
-                "https://hep.gg/upload",
-                headers={"Authorization": token},
-                files={"upload-file": file},
-            )
+        return (images, sum(transferred))
+
+    def DecodeImage(self: Any, data: bytes, mode: str = "RGBA") -> Image.Image:
+        """Return the image object for the provided encoded image data."""
+
+        from PIL import Image
+
+        return Image.open(BytesIO(data)).convert(mode)
+
+    def EncodeImage(
+        self: Any, image: Image.Image, format: str = "PNG", **kwargs
+    ) -> bytes:
+        """Return the provided image object encoded in the specified format."""
+
+        buffer: BytesIO = BytesIO()
+        image.save(buffer, format, **kwargs)
+
+        return buffer.getvalue()
+
+    def UploadImage(
+        self: Any, data: bytes, token: str, filename: str = "store.png"
+    ) -> Optional[str]:
+        """
+        Upload the provided image to the Hep.GG service and return its URL,
+        or None if the upload failed.
+        """
+
+        endpoint: str = self.config.get("endpoints", {}).get(
+            "upload", "https://hep.gg/upload"
+        )
+        res: Dict[str, Any] = Utility.POST(
+            self,
+            endpoint,
+            headers={"Authorization": token},
+            files={"upload-file": (filename, data)},
+        )
+
+        if (isinstance(res, dict) is False) or (res.get("url") is None):
+            log.error(f"Failed to upload image {filename} to {endpoint}")
+
+            return
 
         return res.get("url")
 
+    def RunConcurrently(
+        self: Any,
+        tasks: Dict[str, Callable[[], Any]],
+        timeout: Optional[float] = None,
+        workers: int = 16,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Run the provided tasks concurrently and return the outcome of each,
+        keyed by task name. Tasks which do not finish within the timeout,
+        measured from when each task began running, are reported as timed
+        out; tasks waiting for a worker are never timed out.
+        """
+
+        results: Dict[str, Dict[str, Any]] = {}
+
+        if len(tasks) == 0:
+            return results
+
+        executor: ThreadPoolExecutor = ThreadPoolExecutor(min(workers, len(tasks)))
+        starts: Dict[str, float] = {}
+        pending: Dict[str, Future] = {
+            name: executor.submit(Utility.MeasureTask, self, task, starts, name)
+            for name, task in tasks.items()
+        }
+
+        while len(pending) > 0:
+            wait: Optional[float] = None
+
+            if timeout is not None:
+                deadlines: List[float] = [
+                    starts[name] + timeout for name in pending if name in starts
+                ]
+
+                # Poll until a task begins running and has a deadline to wait on
+                deadline: float = min(deadlines, default=perf_counter() + 0.05)
+                wait = max(deadline - perf_counter(), 0)
+
+            futureWait(pending.values(), wait, FIRST_COMPLETED)
+
+            for name, future in list(pending.items()):
+                if future.done() is True:
+                    results[name] = future.result()
+                elif (timeout is None) or (name not in starts):
+                    continue
+                elif perf_counter() - starts[name] >= timeout:
+                    results[name] = {
+                        "success": False,
+                        "latency": timeout,
+                        "error": f"Timed out after {timeout:,}s",
+                        "timedOut": True,
+                    }
+                else:
+                    continue
+
+                del pending[name]
+
+        # Do not wait on timed out tasks, they are abandoned while running
+        executor.shutdown(wait=False)
+
+        return {name: results[name] for name in tasks}
+
+    def MeasureTask(
+        self: Any,
+        task: Callable[[], Any],
+        starts: Optional[Dict[str, float]] = None,
+        name: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Run the provided task and return its outcome and latency, optionally
+        recording when it began running under the specified name.
+        """
+
+        start: float = perf_counter()
+
+        if starts is not None:
+            starts[name] = start
+
+        try:
+            result: Any = task()
+        except Exception as e:
+            return {
+                "success": False,
+                "latency": perf_counter() - start,
+                "error": str(e) or type(e).__name__,
+            }
+
+        return {"success": True, "latency": perf_counter() - start, "result": result}
+
     def ISOtoHumanDate(self: Any, timestamp: str) -> str:
         """Return the provided ISO8601 timestamp in human-readable date format."""
 
@@ -185,6 +747,21 @@ class Utility:
                     f"Failed to convert timestamp to human-readable time format, {e}"
                 )
 
+    def SecondsSince(self: Any, timestamp: str) -> Optional[float]:
+        """Return the number of seconds elapsed since the provided ISO8601 timestamp."""
+
+        try:
+            then: datetime = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+        except Exception as e:
+            log.warning(f"Failed to parse timestamp {timestamp}, {e}")
+
+            return None
+
+        if then.tzinfo is None:
+            then = then.replace(tzinfo=timezone.utc)
+
+        return (datetime.now(timezone.utc) - then).total_seconds()
+
     def NowISO(self: Any) -> str:
         """Return the current UTC timestamp in ISO format."""
 
@@ -201,6 +778,8 @@ class Utility:
         calculated aspect ratio.
         """
 
+        from PIL import Image
+
         if (width is not None) and (height is not None):
             return image.resize((width, height), Image.ANTIALIAS)
         elif (width is not None) and (height is None):
@@ -223,31 +802,615 @@ class Utility:
             return image.resize((width, height), Image.ANTIALIAS)
 
     def CompressImage(
-        self: Any, inPath: str, outPath: str, outSize: int, percentage: float = 0.9
+        self: Any, image: Image.Image, outSize: int, encodes: int = 6
+    ) -> Tuple[bytes, str]:
+        """
+        Encode the provided image as large as possible while remaining
+        below the desired size, returning the encoded image and its file
+        extension. The size of each format is extrapolated from two
+        downscaled trials, then the scale of the chosen format is searched
+        using at most the specified number of full encodes, the first of
+        which may verify that the preferred format fits at full scale.
+        Should no encode fit, the smallest is returned.
+        """
+
+        from PIL import features
+
+        formats: List[str] = ["png", "jpg"]
+
+        if features.check("webp") is True:
+            formats.insert(0, "webp")
+
+        trialScale: float = min(1.0, (1000000 / (image.width * image.height)) ** 0.5)
+        trials: List[Image.Image] = [
+            Utility.ScaleImage(self, image, trialScale),
+            Utility.ScaleImage(self, image, trialScale / 2),
+        ]
+        estimates: Dict[str, float] = {}
+
+        for extension in formats:
+            sizes: List[int] = [
+                len(Utility.EncodeFormat(self, trial, extension)) for trial in trials
+            ]
+
+            if trialScale >= 1.0:
+                estimates[extension] = sizes[0]
+
+                continue
+
+            # Downscaled images hold more detail per pixel, so the encoded size
+            # grows more slowly than the number of pixels
+            exponent: float = min(max(math.log2(sizes[0] / sizes[1]), 1.0), 2.0)
+            estimates[extension] = sizes[0] * (1 / trialScale) ** exponent
+
+        # Estimates remain approximate, so the preferred format is encoded at
+        # full scale when it may fit before falling back to another format
+        preferred: str = formats[0]
+
+        if (encodes > 1) and (outSize < estimates[preferred] <= outSize * 2):
+            data: bytes = Utility.EncodeFormat(self, image, preferred)
+            encodes -= 1
+
+            if len(data) <= outSize:
+                return (data, preferred)
+
+            estimates[preferred] = len(data)
+
+        # Prefer the first format which is expected to fit at full scale
+        extension: str = min(estimates, key=estimates.get)
+
+        for candidate in formats:
+            if estimates[candidate] <= outSize:
+                extension = candidate
+
+                break
+
+        scale: float = min(1.0, (outSize / estimates[extension]) ** 0.5)
+        low: float = 0.0
+        high: Optional[float] = None
+        best: Optional[bytes] = None
+        smallest: Optional[bytes] = None
+
+        for _ in range(encodes):
+            data: bytes = Utility.EncodeFormat(
+                self, Utility.ScaleImage(self, image, scale), extension
+            )
+
+            if (smallest is None) or (len(data) < len(smallest)):
+                smallest = data
+
+            if len(data) <= outSize:
+                best = data
+                low = scale
+
+                if (scale >= 1.0) or (len(data) >= outSize * 0.95):
+                    break
+            else:
+                high = scale
+
+            # Encoded size is roughly proportional to the number of pixels
+            guess: float = min(scale * ((outSize * 0.98) / len(data)) ** 0.5, 1.0)
+            upper: float = 1.0 if high is None else high
+
+            if (low < guess < upper) or ((high is None) and (guess == 1.0)):
+                scale = guess
+            else:
+                scale = (low + upper) / 2
+
+        if best is None:
+            log.warning(
+                f"Failed to compress the image below {outSize:,} bytes in {encodes:,} encodes, using the smallest attempt ({len(smallest):,} bytes)"
+            )
+
+            return (smallest, extension)
+
+        return (best, extension)
+
+    def StreamPNG(
+        self: Any, size: Tuple[int, int], bands: Iterable[Image.Image], level: int = 9
+    ) -> bytes:
+        """
+        Incrementally encode an RGB PNG of the specified size from the
+        provided horizontal bands, top to bottom, so that only one band
+        must be held in memory at a time. Rows use the PNG Up filter.
+        """
+
+        from PIL import Image, ImageChops
+
+        def Chunk(kind: bytes, data: bytes) -> bytes:
+            return (
+                struct.pack(">I", len(data))
+                + kind
+                + data
+                + struct.pack(">I", zlib.crc32(kind + data))
+            )
+
+        width, height = size
+        stride: int = width * 3
+        output: BytesIO = BytesIO()
+        compressor: Any = zlib.compressobj(level)
+        previous: Image.Image = Image.new("RGB", (width, 1), (0, 0, 0))
+
+        output.write(b"\x89PNG\r\n\x1a\n")
+        output.write(
+            Chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+        )
+
+        for band in bands:
+            # The row above each row, used by the Up filter
+            above: Image.Image = Image.new("RGB", band.size)
+            above.paste(previous, (0, 0))
+            above.paste(band.crop((0, 0, width, band.height - 1)), (0, 1))
+
+            pixels: bytes = ImageChops.subtract_modulo(band, above).tobytes()
+            rows: bytes = b"".join(
+                [
+                    b"\x02" + pixels[i : i + stride]
+                    for i in range(0, len(pixels), stride)
+                ]
+            )
+
+            if len(data := compressor.compress(rows)) > 0:
+                output.write(Chunk(b"IDAT", data))
+
+            previous = band.crop((0, band.height - 1, width, band.height))
+
+        output.write(Chunk(b"IDAT", compressor.flush()))
+        output.write(Chunk(b"IEND", b""))
+
+        return output.getvalue()
+
+    def ScaleImage(self: Any, image: Image.Image, scale: float) -> Image.Image:
+        """Return the provided image object resized by the specified scale."""
+
+        if scale >= 1.0:
+            return image
+
+        return Utility.ResizeImage(self, image, width=max(int(image.width * scale), 1))
+
+    def EncodeFormat(self: Any, image: Image.Image, extension: str) -> bytes:
+        """Encode the provided image using the compression format for the extension."""
+
+        if extension == "webp":
+            return Utility.EncodeImage(self, image, "WEBP", lossless=True, method=4)
+        elif extension == "png":
+            palette: Image.Image = image.convert("RGB").quantize(256)
+
+            return Utility.EncodeImage(self, palette, "PNG")
+        elif extension == "jpg":
+            return Utility.EncodeImage(
+                self, image.convert("RGB"), "JPEG", quality=90, subsampling=0
+            )
+
+    def BytesFile(self: Any, data: bytes, name: str) -> BytesIO:
+        """Return a readable, named binary file object for the provided bytes."""
+
+        file: BytesIO = BytesIO(data)
+        file.name = name
+        file.mode = "rb"
+
+        return file
+
+    def CacheEnabled(self: Any) -> bool:
+        """Return a boolean value indicating whether or not caching is enabled."""
+
+        return self.config.get("cache", {}).get("enabled", False) is True
+
+    def CachePath(self: Any, name: str) -> Path:
+        """Return the path of the specified file within the cache directory."""
+
+        return Path(self.config.get("cache", {}).get("directory", "cache/"), name)
+
+    def LoadCache(self: Any) -> Dict[str, Dict[str, Any]]:
+        """
+        Return the cache index, which tracks the size, last access time,
+        and validators of every cached file, loading it if necessary.
+        """
+
+        with cacheLock:
+            if (index := getattr(self, "cacheIndex", None)) is not None:
+                return index
+
+            try:
+                index = json.loads(Utility.CachePath(self, "index.json").read_text())
+            except FileNotFoundError:
+                index = {}
+            except Exception as e:
+                log.warning(f"Failed to read cache index, {e}")
+
+                index = {}
+
+            self.cacheIndex: Dict[str, Dict[str, Any]] = index
+
+            return index
+
+    def CacheEntry(self: Any, namespace: str, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the index entry of the specified cached file if it exists
+        on disk, otherwise return None.
+        """
+
+        if Utility.CacheEnabled(self) is False:
+            return
+
+        name: str = f"{namespace}/{key}"
+        index: Dict[str, Dict[str, Any]] = Utility.LoadCache(self)
+
+        if (entry := index.get(name)) is None:
+            return
+
+        if Utility.CachePath(self, name).is_file() is False:
+            index.pop(name, None)
+
+            return
+
+        return entry
+
+    def ReadCache(self: Any, namespace: str, key: str) -> Optional[bytes]:
+        """Return the contents of the specified cached file, if it exists."""
+
+        if (entry := Utility.CacheEntry(self, namespace, key)) is None:
+            return
+
+        try:
+            data: bytes = Utility.CachePath(self, f"{namespace}/{key}").read_bytes()
+        except Exception as e:
+            log.warning(f"Failed to read cached file {namespace}/{key}, {e}")
+
+            return
+
+        entry["accessed"] = datetime.utcnow().timestamp()
+
+        return data
+
+    def WriteCache(self: Any, namespace: str, key: str, data: bytes, **kwargs) -> None:
+        """
+        Write the contents of the specified cached file, storing any
+        provided validators (etag, lastModified) in the cache index.
+        """
+
+        if Utility.CacheEnabled(self) is False:
+            return
+
+        name: str = f"{namespace}/{key}"
+        path: Path = Utility.CachePath(self, name)
+
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(data)
+        except Exception as e:
+            log.warning(f"Failed to write cached file {name}, {e}")
+
+            return
+
+        with cacheLock:
+            Utility.LoadCache(self)[name] = {
+                "size": len(data),
+                "accessed": datetime.utcnow().timestamp(),
+                **{k: v for k, v in kwargs.items() if v is not None},
+            }
+
+    def SaveCache(self: Any) -> None:
+        """
+        Evict the least recently used cached files until the cache is
+        below its configured size, then write the cache index to disk.
+        """
+
+        if Utility.CacheEnabled(self) is False:
+            return
+
+        with cacheLock:
+            Utility.EvictCache(self)
+
+    def EvictCache(self: Any) -> None:
+        """Implementation of SaveCache, which must hold the cache lock."""
+
+        index: Dict[str, Dict[str, Any]] = Utility.LoadCache(self)
+        limit: int = self.config["cache"].get("maxSize", 536870912)
+        size: int = sum([entry.get("size", 0) for entry in index.values()])
+        evicted: int = 0
+
+        for name, entry in sorted(index.items(), key=lambda i: i[1].get("accessed", 0)):
+            if size <= limit:
+                break
+
+            Utility.CachePath(self, name).unlink(missing_ok=True)
+            index.pop(name)
+
+            size -= entry.get("size", 0)
+            evicted += 1
+
+        if evicted > 0:
+            log.info(
+                f"Evicted {evicted:,} files from the cache ({size:,} bytes remain)"
+            )
+
+        path: Path = Utility.CachePath(self, "index.json")
+
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.with_suffix(".tmp").write_text(json.dumps(index))
+            path.with_suffix(".tmp").replace(path)
+        except Exception as e:
+            log.warning(f"Failed to write cache index, {e}")
+
+    def StartMetrics(self: Any) -> None:
+        """Begin recording the metrics of a new run."""
+
+        with metricsLock:
+            self.metrics: Dict[str, Any] = {
+                "timestamp": datetime.utcnow().timestamp(),
+                "start": perf_counter(),
+                "profile": getattr(self, "profile", None),
+                "status": "unchanged",
+                "stages": {},
+                "cards": {},
+                "targets": {},
+                "bytesDownloaded": 0,
+                "bytesUploaded": 0,
+            }
+
+    def MeasureStage(self: Any, stage: str, task: Callable[[], Any]) -> Any:
+        """
+        Run the provided task and add its duration to the specified stage
+        of the current run, returning the result of the task.
+        """
+
+        start: float = perf_counter()
+
+        try:
+            return task()
+        finally:
+            Utility.RecordStage(self, stage, perf_counter() - start)
+
+    def RecordStage(self: Any, stage: str, elapsed: float) -> None:
+        """Add the provided duration to the specified stage of the current run."""
+
+        with metricsLock:
+            if (metrics := getattr(self, "metrics", None)) is not None:
+                stages: Dict[str, float] = metrics["stages"]
+                stages[stage] = stages.get(stage, 0.0) + elapsed
+
+    def RecordMetric(
+        self: Any, name: str, value: Any, group: Optional[str] = None
     ) -> None:
-        """Resize an image at the specified rate until it is below the desired threshold."""
+        """Record the provided value for the specified metric of the current run."""
+
+        with metricsLock:
+            if (metrics := getattr(self, "metrics", None)) is None:
+                return
+
+            if group is None:
+                metrics[name] = value
+            else:
+                metrics[group][name] = value
+
+    def CountBytes(self: Any, counter: str, amount: int) -> None:
+        """Add the provided number of bytes to the specified counter."""
 
-        inSize: int = Utility.GetFileSize(self, inPath)
-        inImage: Image.Image = Utility.OpenImage(self, inPath, "")
-        inWidth: int = int(inImage.width * percentage)
+        with metricsLock:
+            if (metrics := getattr(self, "metrics", None)) is not None:
+                metrics[counter] += amount
 
-        while inSize > outSize:
-            outImage: Image.Image = Utility.ResizeImage(self, inImage, width=inWidth)
-            outImage.save(outPath)
+    def PeakRSS(self: Any, children: bool = False) -> Optional[int]:
+        """
+        Return the peak resident set size (in bytes) of this process, or
+        of its terminated child processes, if it can be determined.
+        """
+
+        if resource is None:
+            return None
 
-            inSize = Utility.GetFileSize(self, outPath)
-            inWidth = int(inWidth * percentage)
+        who: int = resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF
+        peak: int = resource.getrusage(who).ru_maxrss
+
+        # ru_maxrss is reported in bytes on macOS and kilobytes elsewhere
+        if sys.platform == "darwin":
+            return peak
+
+        return peak * 1024
+
+    def SaveMetrics(self: Any) -> Optional[Dict[str, Any]]:
+        """
+        Finish recording the metrics of the current run, then append them
+        to the configured JSON lines file and optionally write them to a
+        Prometheus textfile.
+        """
+
+        with metricsLock:
+            if (metrics := getattr(self, "metrics", None)) is None:
+                return
+
+            self.metrics = None
+
+        settings: Dict[str, Any] = self.config.get("metrics", {})
+        record: Dict[str, Any] = {
+            "timestamp": metrics.pop("timestamp"),
+            "duration": perf_counter() - metrics.pop("start"),
+            **metrics,
+            "peakRss": Utility.PeakRSS(self),
+            "peakRssWorkers": Utility.PeakRSS(self, children=True),
+        }
+
+        if record["status"] == "published":
+            self.lastPublish: Dict[str, Any] = record
+
+        if settings.get("enabled", False) is not True:
+            return record
+
+        try:
+            with open(settings.get("path", "metrics.jsonl"), "a") as file:
+                file.write(json.dumps(record) + "\n")
+        except Exception as e:
+            log.warning(f"Failed to write metrics, {e}")
+
+        if (textfile := settings.get("prometheus")) is not None:
+            path: Path = Path(textfile)
+
+            # Profiles run concurrently, so each writes its own textfile
+            if (profile := record.get("profile")) is not None:
+                path = path.with_name(f"{path.stem}_{profile}{path.suffix}")
+
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.with_suffix(".tmp").write_text(Utility.FormatMetrics(self, record))
+                path.with_suffix(".tmp").replace(path)
+            except Exception as e:
+                log.warning(f"Failed to write Prometheus metrics, {e}")
+
+        return record
+
+    def FormatMetrics(self: Any, record: Dict[str, Any]) -> str:
+        """
+        Return the provided run metrics in the Prometheus text exposition
+        format. Publishing metrics are carried over from the last run which
+        published the Store. Every sample of a profile is labelled with
+        its name.
+        """
+
+        lastPublish: Dict[str, Any] = getattr(self, "lastPublish", None) or {}
+        families: List[Tuple[str, str, List[Tuple[Dict[str, str], Any]]]] = [
+            (
+                "emporium_last_run_timestamp_seconds",
+                "Unix time at which the last run started.",
+                [({"status": record["status"]}, record["timestamp"])],
+            ),
+            (
+                "emporium_run_duration_seconds",
+                "Duration of the last run.",
+                [({}, record["duration"])],
+            ),
+            (
+                "emporium_stage_duration_seconds",
+                "Duration of each stage of the last run.",
+                [({"stage": k}, v) for k, v in record["stages"].items()],
+            ),
+            (
+                "emporium_run_downloaded_bytes",
+                "Number of bytes downloaded during the last run.",
+                [({}, record["bytesDownloaded"])],
+            ),
+            (
+                "emporium_run_uploaded_bytes",
+                "Number of bytes uploaded during the last run.",
+                [({}, record["bytesUploaded"])],
+            ),
+            (
+                "emporium_peak_rss_bytes",
+                "Peak resident set size of the process and its render workers.",
+                [
+                    ({"process": k}, record[v])
+                    for k, v in [("main", "peakRss"), ("workers", "peakRssWorkers")]
+                    if record[v] is not None
+                ],
+            ),
+            (
+                "emporium_last_publish_timestamp_seconds",
+                "Unix time at which the Store was last published.",
+                [({}, lastPublish.get("timestamp"))],
+            ),
+            (
+                "emporium_time_to_publish_seconds",
+                "Seconds between the last Store update and its publication.",
+                [({}, lastPublish.get("timeToPublish"))],
+            ),
+            (
+                "emporium_target_latency_seconds",
+                "Publishing latency of each target when the Store was last published.",
+                [
+                    ({"target": k}, v.get("latency"))
+                    for k, v in lastPublish.get("targets", {}).items()
+                ],
+            ),
+            (
+                "emporium_target_success",
+                "Whether each target succeeded when the Store was last published.",
+                [
+                    ({"target": k}, int(v.get("success") is True))
+                    for k, v in lastPublish.get("targets", {}).items()
+                ],
+            ),
+        ]
+
+        lines: List[str] = []
+
+        for name, description, samples in families:
+            samples = [
+                (labels, value) for labels, value in samples if value is not None
+            ]
+
+            if len(samples) == 0:
+                continue
+
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} gauge")
+
+            for labels, value in samples:
+                if (profile := record.get("profile")) is not None:
+                    labels = {"profile": profile, **labels}
+
+                pairs: List[str] = []
+
+                for key, label in labels.items():
+                    label = label.replace("\\", "\\\\").replace("\n", "\\n")
+                    label = label.replace('"', '\\"')
+
+                    pairs.append(f'{key}="{label}"')
+
+                selector: str = f"{{{','.join(pairs)}}}" if len(pairs) > 0 else ""
+
+                lines.append(f"{name}{selector} {value}")
+
+        return "\n".join(lines) + "\n"
 
     def GetTTF(
         self: Any, size: int, name: str, directory: str = "assets/fonts/"
     ) -> ImageFont.truetype:
-        """Get the font object for the specified TrueType Font file and size."""
+        """
+        Get the font object for the specified TrueType Font file and size,
+        only loading each file and size combination once.
+        """
+
+        from PIL import ImageFont
+
+        fonts: Dict[Tuple[str, str, int], ImageFont.FreeTypeFont] = getattr(
+            self, "fonts", {}
+        )
+
+        if (font := fonts.get((directory, name, size))) is not None:
+            return font
 
         try:
-            return ImageFont.truetype(f"{directory}{name}.ttf", size)
+            font = ImageFont.truetype(f"{directory}{name}.ttf", size)
         except Exception as e:
             log.error(f"Failed to load TrueType Font, {e}")
 
+            return
+
+        fonts[(directory, name, size)] = font
+        self.fonts: Dict[Tuple[str, str, int], ImageFont.FreeTypeFont] = fonts
+
+        return font
+
+    def MergeConfig(
+        self: Any, base: Dict[str, Any], overrides: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Return a copy of the base configuration with the provided overrides
+        recursively merged into it. Values which are not objects, such as
+        lists, are replaced entirely.
+        """
+
+        merged: Dict[str, Any] = dict(base)
+
+        for key, value in overrides.items():
+            if isinstance(value, dict) and isinstance(merged.get(key), dict):
+                merged[key] = Utility.MergeConfig(self, merged[key], value)
+            else:
+                merged[key] = value
+
+        return merged
+
     def CenterX(
         self: Any, foregroundWidth: int, backgroundWidth: int, marginTop: int = 0
     ) -> Tuple[int, int]: